@@ -2,7 +2,8 @@
 Factory pour créer les adaptateurs d'outils
 """
 
-from typing import Dict, List, Any
+import importlib
+from typing import Dict, List, Any, Tuple, Union
 from ..interfaces import ToolAdapter
 
 
@@ -12,11 +13,14 @@ class ToolAdapterFactory:
     Pattern: Factory + Registry
     """
 
-    _registry: Dict[str, type] = {}
+    _registry: Dict[str, Union[type, Tuple[str, str]]] = {}
 
     @classmethod
-    def register(cls, tool_type: str, adapter_class: type) -> None:
-        """Enregistre un type d'adaptateur d'outil"""
+    def register(cls, tool_type: str, adapter_class: Union[type, Tuple[str, str]]) -> None:
+        """
+        Enregistre un type d'adaptateur d'outil
+        Accepte une classe ou un tuple (module, nom de classe) importé à la première création
+        """
         cls._registry[tool_type] = adapter_class
 
     @classmethod
@@ -26,6 +30,10 @@ class ToolAdapterFactory:
             raise ValueError(f"Type d'adaptateur d'outil inconnu: {tool_type}")
 
         adapter_class = cls._registry[tool_type]
+        if isinstance(adapter_class, tuple):
+            module_path, class_name = adapter_class
+            adapter_class = getattr(importlib.import_module(module_path), class_name)
+            cls._registry[tool_type] = adapter_class
         return adapter_class(name, config)
 
     @classmethod
@@ -34,6 +42,6 @@ class ToolAdapterFactory:
         return list(cls._registry.keys())
 
     @classmethod
-    def get_registry(cls) -> Dict[str, type]:
+    def get_registry(cls) -> Dict[str, Union[type, Tuple[str, str]]]:
         """Retourne le registre complet"""
         return cls._registry.copy()
\ No newline at end of file
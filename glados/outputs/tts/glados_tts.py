@@ -4,24 +4,98 @@ Utilise Piper TTS avec la voix GLaDOS pour la synthèse vocale
 """
 
 import asyncio
+import hashlib
+import itertools
+import json
+import math
 import tempfile
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, Tuple
 import sounddevice as sd
 import numpy as np
 import wave
 import os
+import re
 import subprocess
 
 from ...core.interfaces import OutputModule, GLaDOSMessage, MessageType
 
+# Taille du tampon d'écriture des fichiers WAV (1 Mio)
+WAV_WRITE_BUFFER_SIZE = 1 << 20
+
+# Découpage en phrases pour pipeliner synthèse et lecture des réponses longues
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+PIPELINE_QUEUE_SIZE = 2
+
+# Estimation de la taille de sortie Piper (~1200 échantillons par caractère à 22050 Hz)
+SAMPLES_PER_CHAR_HINT = 1200
+
+# Noms des entrées du modèle Piper découpé : l'encodeur produit z et y_mask,
+# consommés sous les mêmes noms par le décodeur
+ENCODER_INPUT_NAMES = ('input', 'input_lengths', 'scales')
+DECODER_INPUT_NAMES = ('z', 'y_mask')
+
+
+class _StreamingResampler:
+    """
+    Rééchantillonnage polyphase par blocs successifs d'un même signal.
+    La sortie est identique à scipy.signal.resample_poly appliqué au signal complet :
+    chaque bloc est calculé avec l'historique nécessaire au filtre, sans effet de bord
+    """
+
+    def __init__(self, input_rate: int, output_rate: int):
+        factor = math.gcd(input_rate, output_rate)
+        self.up = output_rate // factor
+        self.down = input_rate // factor
+        # Demi-longueur du filtre utilisé par resample_poly (à la cadence suréchantillonnée)
+        self.half_len = 10 * max(self.up, self.down)
+        self._input = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # Position dans le signal du premier échantillon conservé
+        self._emitted = 0  # Nombre d'échantillons de sortie déjà produits
+
+    def process(self, block: np.ndarray, final: bool = False) -> np.ndarray:
+        """Ajoute un bloc et retourne les échantillons de sortie devenus calculables"""
+        import scipy.signal
+
+        up, down = self.up, self.down
+        self._input = np.concatenate((self._input, block.astype(np.float32, copy=False)))
+        total = self._offset + len(self._input)
+
+        # Sortie j calculable quand tout son support d'entrée est disponible
+        if final:
+            end = -(-total * up // down)
+        else:
+            end = max(self._emitted, -((self.half_len - total * up) // down))
+        if end == self._emitted:
+            return np.zeros(0, dtype=np.float32)
+
+        # Début de tranche multiple de down : la sortie locale k correspond à la sortie
+        # globale k + start * up / down (alignement exact des phases du filtre)
+        first_needed = max(0, -((self.half_len - self._emitted * down) // up))
+        start = max(self._offset, first_needed // down * down)
+        resampled = scipy.signal.resample_poly(self._input[start - self._offset:], up, down)
+        shift = start * up // down
+        output = resampled[self._emitted - shift:end - shift]
+
+        # Oublier l'entrée qui ne sert plus aux sorties suivantes
+        self._input = self._input[start - self._offset:]
+        self._offset = start
+        self._emitted = end
+        return output
+
 
 class GLaDOSTTSOutput(OutputModule):
     """
     Module de sortie Text-to-Speech avec voix GLaDOS
     Utilise Piper TTS pour générer l'audio avec la voix GLaDOS
     """
+
+    # Corrections de prononciation appliquées avant la synthèse (compilées une fois)
+    _NORMALIZE = (
+        (re.compile(r'GLaDOS'), 'Gladoss'),
+    )
     
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, config)
@@ -32,9 +106,39 @@ class GLaDOSTTSOutput(OutputModule):
         self.device_id = config.get('device_id', None)
         self.sample_rate = config.get('sample_rate', 22050)
         self.volume = config.get('volume', 0.8)
+        self.debug_save_wav = config.get('debug_save_wav', False)  # Conserver les WAV générés
+
+        # Modèle Piper découpé encodeur/décodeur (optionnel, synthèse en streaming)
+        self.encoder_model_path = config.get('encoder_model_path')
+        self.decoder_model_path = config.get('decoder_model_path')
+        self.decoder_chunk_frames = config.get('decoder_chunk_frames', 32)
+        # Contexte décodé de chaque côté d'une fenêtre puis retiré (évite les clics aux jointures)
+        self.decoder_overlap_frames = config.get('decoder_overlap_frames', 8)
+        # Gain fixe de la sortie du décodeur : contrairement à PiperVoice.synthesize,
+        # le streaming ne peut pas normaliser chaque phrase sur son pic (inconnu avant
+        # la fin du décodage), le niveau peut donc différer de la synthèse complète
+        self.decoder_gain = config.get('decoder_gain', 1.0)
+        # Graphe ONNX optimisé (fusions) sauvegardé sur disque au premier chargement
+        self.onnx_optimize = config.get('onnx_optimize', True)
+        # Execution providers ONNX Runtime par ordre de préférence (GPU si disponible)
+        self.ort_providers = config.get('ort_providers', ['CPUExecutionProvider'])
+
+        # Cache LRU des synthèses (texte normalisé -> échantillons), borné en nombre
+        # d'entrées et en mémoire totale (les réponses longues pèsent plusieurs Mo)
+        self.audio_cache_size = config.get('audio_cache_size', 256)
+        self.audio_cache_max_bytes = config.get('audio_cache_max_bytes', 32 * 1024 * 1024)
         
         # État
         self.temp_dir = None
+        self.voice = None  # Voix Piper chargée une seule fois
+        self._stream = None  # Flux audio de sortie persistant
+        self._encoder_session = None  # Session ONNX encodeur (modèle découpé)
+        self._decoder_session = None  # Session ONNX décodeur (modèle découpé)
+        self._file_counter = itertools.count()  # Numérotation des fichiers WAV générés
+        self._audio_cache: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._audio_cache_bytes = 0  # Mémoire occupée par les échantillons en cache
+        # Un seul message synthétisé/joué à la fois sur le flux de sortie partagé
+        self._speak_lock = asyncio.Lock()
     
     async def initialize(self) -> bool:
         """Initialise le module TTS GLaDOS"""
@@ -50,7 +154,9 @@ class GLaDOSTTSOutput(OutputModule):
                 self.model_path = str(model_file)
                 self.logger.info(f"Chemin modèle converti en absolu: {self.model_path}")
 
-            if not model_file.exists():
+            try:
+                model_size = model_file.stat().st_size
+            except FileNotFoundError:
                 self.logger.error(f"Modèle TTS GLaDOS non trouvé: {self.model_path}")
                 self.logger.info("Téléchargez le modèle depuis: https://huggingface.co/rhasspy/piper-voices")
 
@@ -67,19 +173,37 @@ class GLaDOSTTSOutput(OutputModule):
 
                 return False
 
-            self.logger.info(f"Modèle TTS trouvé: {self.model_path} ({model_file.stat().st_size} octets)")
+            self.logger.info(f"Modèle TTS trouvé: {self.model_path} ({model_size} octets)")
             
             # Créer répertoire cache permanent pour les fichiers audio
             cache_base = Path(tempfile.gettempdir()) / "glados_tts_cache"
             cache_base.mkdir(exist_ok=True)
             self.temp_dir = cache_base
             self.logger.info(f"Répertoire cache TTS: {self.temp_dir}")
+
+            # Nettoyage unique des fichiers laissés par une exécution précédente
+            self._cleanup_old_temp_files()
             
             # Vérifier Piper TTS
             if not await self._check_piper_installation():
                 self.logger.error("Piper TTS non disponible")
                 return False
-            
+
+            # Charger la voix une seule fois pour toutes les synthèses
+            if self.use_piper_library:
+                self.voice = await asyncio.to_thread(self._load_voice)
+                self.logger.info(f"Modèle chargé avec succès - Sample rate: {self.voice.config.sample_rate}")
+
+                # Sessions encodeur/décodeur pour la synthèse en streaming
+                if self.encoder_model_path and self.decoder_model_path:
+                    await asyncio.to_thread(self._load_split_model)
+
+            # Vérifier une seule fois le device de sortie
+            self._check_output_device()
+
+            # Ouvrir le flux audio persistant (évite l'ouverture PortAudio par message)
+            self._open_output_stream()
+
             self.is_active = True
             self.logger.info("Module TTS GLaDOS initialisé avec succès")
             return True
@@ -115,6 +239,144 @@ class GLaDOSTTSOutput(OutputModule):
             self.logger.error(f"Erreur vérification Piper: {e}")
             return False
     
+    def _load_voice(self):
+        """Charge la voix Piper, depuis le graphe ONNX optimisé si disponible"""
+        from piper import PiperVoice
+        from piper.config import PiperConfig
+
+        model_file = Path(self.model_path)
+        optimized_file = self._optimized_model_file(model_file)
+        if optimized_file != model_file:
+            self.logger.info(f"Chargement du modèle optimisé: {optimized_file.name}")
+
+        # La configuration de la voix reste celle du modèle d'origine
+        with open(f"{model_file}.json", "r", encoding="utf-8") as config_file:
+            config = PiperConfig.from_dict(json.load(config_file))
+
+        # Une seule session, créée avec les execution providers configurés
+        # (PiperVoice.load ne gère que le CPU ou CUDA)
+        session = self._create_session(optimized_file)
+        self.logger.info(f"Execution providers Piper: {session.get_providers()}")
+        return PiperVoice(session=session, config=config)
+
+    def _available_providers(self) -> list:
+        """Filtre les execution providers configurés sur ceux installés"""
+        import onnxruntime as ort
+
+        available = set(ort.get_available_providers())
+        providers = [provider for provider in self.ort_providers if provider in available]
+        if not providers:
+            self.logger.warning(f"Aucun execution provider disponible parmi {self.ort_providers}, utilisation du CPU")
+            providers = ['CPUExecutionProvider']
+        return providers
+
+    def _create_session(self, model_file: Path, options=None, providers=None):
+        """Crée une session ONNX Runtime avec les execution providers configurés"""
+        import onnxruntime as ort
+
+        return ort.InferenceSession(
+            str(model_file),
+            sess_options=options or ort.SessionOptions(),
+            providers=providers or self._available_providers()
+        )
+
+    def _optimized_model_file(self, model_file: Path) -> Path:
+        """
+        Retourne la version optimisée (ORT_ENABLE_EXTENDED) d'un modèle ONNX.
+        Le graphe est optimisé et sauvegardé une seule fois, puis réutilisé tant que
+        le modèle d'origine n'est pas plus récent. Le nom du fichier inclut la version
+        d'ONNX Runtime et les providers utilisés : les fusions propres à un provider ne
+        sont jamais rechargées avec un autre. Le niveau ORT_ENABLE_ALL n'est pas
+        sauvegardé : ses fusions dépendent de la machine, il reste appliqué à chaque
+        chargement de session.
+        """
+        if not self.onnx_optimize:
+            return model_file
+
+        try:
+            import onnxruntime as ort
+
+            providers = self._available_providers()
+            variant = hashlib.sha1(f"{ort.__version__}|{','.join(providers)}".encode('utf-8')).hexdigest()[:8]
+            optimized_file = model_file.with_name(f"{model_file.stem}.opt-extended-{variant}.onnx")
+            try:
+                if optimized_file.stat().st_mtime >= model_file.stat().st_mtime:
+                    return optimized_file
+            except FileNotFoundError:
+                pass
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+            options.optimized_model_filepath = str(optimized_file)
+            # Optimiser avec les providers qui chargeront ensuite le fichier
+            self._create_session(model_file, options, providers)
+            self.logger.info(f"Graphe ONNX optimisé sauvegardé: {optimized_file}")
+            return optimized_file
+        except Exception as e:
+            self.logger.warning(f"Optimisation ONNX impossible pour {model_file.name}: {e}")
+            return model_file
+
+    def _load_split_model(self) -> None:
+        """Charge les sessions ONNX encodeur/décodeur du modèle Piper découpé"""
+        import onnxruntime as ort
+
+        project_root = Path(__file__).parent.parent.parent.parent
+        encoder_file = Path(self.encoder_model_path)
+        decoder_file = Path(self.decoder_model_path)
+        if not encoder_file.is_absolute():
+            encoder_file = project_root / encoder_file
+        if not decoder_file.is_absolute():
+            decoder_file = project_root / decoder_file
+
+        try:
+            # Options séparées : le décodeur peut être quantifié (int8) indépendamment
+            encoder_options = ort.SessionOptions()
+            decoder_options = ort.SessionOptions()
+            encoder_file = self._optimized_model_file(encoder_file)
+            decoder_file = self._optimized_model_file(decoder_file)
+            self._encoder_session = self._create_session(encoder_file, encoder_options)
+            self._decoder_session = self._create_session(decoder_file, decoder_options)
+
+            # Entrées et sorties liées par nom : vérifier que l'export correspond
+            for kind, names, expected in (
+                ("entrées encodeur", self._encoder_session.get_inputs(), ENCODER_INPUT_NAMES),
+                ("sorties encodeur", self._encoder_session.get_outputs(), DECODER_INPUT_NAMES),
+                ("entrées décodeur", self._decoder_session.get_inputs(), DECODER_INPUT_NAMES)
+            ):
+                names = {node.name for node in names}
+                if not names.issuperset(expected):
+                    raise ValueError(f"{kind} {sorted(names)}, attendues {list(expected)}")
+            self.logger.info(f"Modèle découpé chargé: {encoder_file.name} + {decoder_file.name}")
+        except Exception as e:
+            self.logger.warning(f"Modèle encodeur/décodeur indisponible, synthèse monolithique: {e}")
+            self._encoder_session = None
+            self._decoder_session = None
+
+    def _check_output_device(self) -> None:
+        """Valide le device de sortie au démarrage (device par défaut si indisponible)"""
+        try:
+            sd.check_output_settings(
+                device=self.device_id, samplerate=self.sample_rate, channels=1, dtype='int16'
+            )
+        except Exception as e:
+            self.logger.warning(f"Device {self.device_id} non disponible, utilisation du device par défaut. Erreur: {e}")
+            self.device_id = None
+
+    def _open_output_stream(self) -> None:
+        """Ouvre le flux de sortie sounddevice réutilisé pour chaque message"""
+        try:
+            self._stream = sd.OutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype='int16',
+                device=self.device_id
+            )
+            self._stream.start()
+            self.logger.info(f"Flux audio persistant ouvert ({self.sample_rate} Hz, device {self.device_id})")
+        except Exception as e:
+            self.logger.warning(f"Flux audio persistant indisponible, lecture via sd.play: {e}")
+            self._stream = None
+
     async def send_message(self, message: GLaDOSMessage) -> bool:
         """
         Synthétise et joue un message texte avec la voix GLaDOS
@@ -132,132 +394,199 @@ class GLaDOSTTSOutput(OutputModule):
             if not text:
                 return True  # Rien à dire
 
-            # Nettoyer les anciens fichiers temporaires avant la synthèse
-            self._cleanup_old_temp_files()
-
-            text = text.replace('GLaDOS', 'Gladoss')
+            for pattern, replacement in self._NORMALIZE:
+                text = pattern.sub(replacement, text)
             self.logger.info(f"Synthèse TTS: '{text}'")
-            
-            # Générer l'audio
-            audio_file = await self._synthesize_text(text)
-            if not audio_file:
-                return False
-            
-            # Jouer l'audio
-            success = await self._play_audio(audio_file)
-
-            # Nettoyer le fichier temporaire immédiatement après lecture
-            try:
-                if audio_file.exists():
-                    audio_file.unlink()
-                    self.logger.debug(f"Fichier temporaire supprimé: {audio_file}")
 
-            except Exception as cleanup_error:
-                self.logger.warning(f"Impossible de supprimer le fichier temporaire {audio_file}: {cleanup_error}")
+            # Les modules d'entrée tournent en tâches séparées : sérialiser les
+            # réponses pour ne pas entremêler leurs écritures sur le flux audio
+            async with self._speak_lock:
+                # Réponses récurrentes : rejouer directement l'audio en cache
+                cache_key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+                cached = self._audio_cache.get(cache_key)
+                if cached is not None:
+                    self._audio_cache.move_to_end(cache_key)
+                    self.logger.info("Audio trouvé en cache, synthèse ignorée")
+                    return await self._play_audio(*cached)
+
+                # Synthèse en streaming : chaque fenêtre décodée est jouée immédiatement
+                if self._decoder_session is not None and self._stream is not None:
+                    return await self._speak_streaming(text)
+
+                # Texte long : synthétiser la phrase suivante pendant la lecture
+                sentences = [s for s in SENTENCE_SPLIT_RE.split(text) if s]
+                if len(sentences) > 1 and self._stream is not None:
+                    return await self._speak_pipelined(sentences, cache_key)
             
-            return success
+                # Générer l'audio (en mémoire)
+                synthesis = await self._synthesize_text(text)
+                if synthesis is None:
+                    return False
+                samples, sample_rate = synthesis
+                self._cache_audio(cache_key, samples, sample_rate)
+            
+                # Jouer l'audio
+                return await self._play_audio(samples, sample_rate)
             
         except Exception as e:
             self.logger.error(f"Erreur envoi message TTS: {e}")
             return False
     
-    async def _synthesize_text(self, text: str) -> Path:
+    async def _speak_pipelined(self, sentences: list, cache_key: str) -> bool:
+        """Synthétise les phrases en tâche de fond et les joue au fil de l'eau"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+        async def produce():
+            try:
+                for sentence in sentences:
+                    synthesis = await self._synthesize_text(sentence)
+                    if synthesis is None:
+                        break  # Lecture interrompue : inutile de synthétiser la suite
+                    await queue.put(synthesis)
+            except asyncio.CancelledError:
+                raise  # Plus de lecteur : ne pas attendre de place dans la file
+            except Exception as e:
+                self.logger.error(f"Erreur synthèse de phrase: {e}")
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        played = []
+        try:
+            while (synthesis := await queue.get()) is not None:
+                samples, sample_rate = synthesis
+                await asyncio.to_thread(self._write_audio, samples, sample_rate)
+                played.append(synthesis)
+        finally:
+            producer.cancel()
+            await asyncio.wait((producer,))
+
+        if len(played) != len(sentences):
+            self.logger.error("Synthèse incomplète du texte découpé")
+            return False
+
+        sample_rate = played[0][1]
+        if all(rate == sample_rate for _, rate in played):
+            self._cache_audio(cache_key, np.concatenate([samples for samples, _ in played]), sample_rate)
+
+        self.logger.info(f"Audio GLaDOS joué en {len(played)} phrases")
+        return True
+
+    def _cache_audio(self, cache_key: str, samples: np.ndarray, sample_rate: int) -> None:
+        """Ajoute une synthèse au cache LRU en évinçant les plus anciennes si plein"""
+        # Une synthèse plus grosse que tout le cache n'est pas gardée
+        if self.audio_cache_size <= 0 or samples.nbytes > self.audio_cache_max_bytes:
+            return
+        previous = self._audio_cache.pop(cache_key, None)
+        if previous is not None:
+            self._audio_cache_bytes -= previous[0].nbytes
+        self._audio_cache[cache_key] = (samples, sample_rate)
+        self._audio_cache_bytes += samples.nbytes
+        while (len(self._audio_cache) > self.audio_cache_size
+               or self._audio_cache_bytes > self.audio_cache_max_bytes):
+            evicted, _ = self._audio_cache.popitem(last=False)[1]
+            self._audio_cache_bytes -= evicted.nbytes
+
+    def _next_output_file(self) -> Path:
+        """Chemin unique pour un fichier WAV généré (compteur monotone)"""
+        return self.temp_dir / f"glados_output_{os.getpid()}_{next(self._file_counter)}.wav"
+
+    async def _synthesize_text(self, text: str) -> Optional[Tuple[np.ndarray, int]]:
         """
         Synthétise le texte en audio GLaDOS
 
         Returns:
-            Chemin vers le fichier audio généré
+            Tuple (échantillons int16, fréquence d'échantillonnage) ou None en cas d'échec
         """
         try:
-            output_file = self.temp_dir / f"glados_output_{asyncio.get_event_loop().time()}.wav"
-
-            self.logger.info(f"Début synthèse: '{text[:50]}...' vers {output_file}")
+            self.logger.info(f"Début synthèse: '{text[:50]}...'")
             self.logger.info(f"Méthode utilisée: {'librairie Piper' if self.use_piper_library else 'commande piper'}")
 
             if self.use_piper_library:
                 # Utiliser la librairie Piper
-                success = await self._synthesize_with_library(text, output_file)
+                synthesis = await self._synthesize_with_library(text)
             else:
                 # Utiliser la commande piper
-                success = await self._synthesize_with_command(text, output_file)
-
-            if success and output_file.exists():
-                file_size = output_file.stat().st_size
-                self.logger.info(f"Synthèse réussie - Fichier: {file_size} octets")
+                synthesis = await self._synthesize_with_command(text)
 
-                if file_size <= 44:  # Seulement l'en-tête WAV
-                    self.logger.error("DIAGNOSTIC: Fichier audio vide (44 octets = en-tête WAV seulement)")
-                    return None
-
-                return output_file
-            else:
+            if synthesis is None or not len(synthesis[0]):
                 self.logger.error("Échec de la synthèse TTS")
-                if output_file.exists():
-                    self.logger.error(f"Fichier existe mais échec reporté - Taille: {output_file.stat().st_size} octets")
                 return None
 
+            samples, sample_rate = synthesis
+            self.logger.info(f"Synthèse réussie - {len(samples)} échantillons à {sample_rate} Hz")
+
+            # Sauvegarde WAV uniquement en mode debug
+            if self.debug_save_wav:
+                output_file = self._next_output_file()
+                self._save_wav(samples, sample_rate, output_file)
+                self.logger.info(f"Audio sauvegardé (debug): {output_file}")
+
+            return samples, sample_rate
+
         except Exception as e:
             self.logger.error(f"Erreur synthèse TTS: {e}")
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             return None
     
-    async def _synthesize_with_library(self, text: str, output_file: Path) -> bool:
+    async def _synthesize_with_library(self, text: str) -> Optional[Tuple[np.ndarray, int]]:
         """Synthèse avec la librairie Piper - AVEC AUDIO_INT16_BYTES"""
         try:
-            from piper import PiperVoice
+            voice = self.voice
+            if voice is None:
+                from piper import PiperVoice
 
-            self.logger.info(f"Chargement du modèle: {self.model_path}")
-            # Charger le modèle
-            voice = PiperVoice.load(str(self.model_path))
-            self.logger.info(f"Modèle chargé avec succès - Sample rate: {voice.config.sample_rate}")
+                self.logger.info(f"Chargement du modèle: {self.model_path}")
+                voice = self.voice = await asyncio.to_thread(PiperVoice.load, str(self.model_path))
+                self.logger.info(f"Modèle chargé avec succès - Sample rate: {voice.config.sample_rate}")
 
             # Synthèse avec extraction correcte des AudioChunk
             self.logger.info(f"Synthèse TTS : '{text[:50]}...'")
 
-            # Collecte des données audio depuis le générateur
-            audio_data = b""
-            chunk_count = 0
-
-            for chunk in voice.synthesize(text):
-                if hasattr(chunk, 'audio_int16_bytes'):
-                    audio_data += chunk.audio_int16_bytes
-                    chunk_count += 1
-                else:
-                    self.logger.warning(f"Chunk sans audio_int16_bytes: {type(chunk)}, attributs: {dir(chunk)}")
+            # Collecte des données audio hors de la boucle d'événements
+            audio_data, chunk_count = await asyncio.to_thread(self._collect_audio, voice, text)
 
             self.logger.info(f"Audio collecté: {len(audio_data)} octets en {chunk_count} chunks")
 
             if not audio_data:
                 self.logger.error("Aucune donnée audio générée par Piper")
-                return False
-
-            # Écriture du fichier WAV avec les données collectées
-            with wave.open(str(output_file), "wb") as wav_file:
-                wav_file.setframerate(voice.config.sample_rate)
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setnchannels(1)  # mono
-                wav_file.writeframes(audio_data)
-
-            # Vérification finale
-            file_size = output_file.stat().st_size
-            self.logger.info(f"Synthèse terminée - Fichier généré: {file_size} octets")
-
-            if file_size <= 44:
-                self.logger.error("PROBLÈME: Fichier audio vide (seulement en-tête WAV)")
-                return False
+                return None
 
             self.logger.info("Synthèse TTS réussie avec audio_int16_bytes!")
-            return True
+            return np.frombuffer(audio_data, dtype=np.int16), voice.config.sample_rate
 
         except Exception as e:
             self.logger.error(f"Erreur synthèse librairie: {e}")
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
-            return False
+            return None
     
-    async def _synthesize_with_command(self, text: str, output_file: Path) -> bool:
+    def _collect_audio(self, voice, text: str) -> Tuple[bytearray, int]:
+        """Consomme le générateur Piper (bloquant, exécuté dans un thread)"""
+        # Tampon préalloué d'après la longueur du texte : pas de réallocation en général
+        audio_data = bytearray(len(text) * SAMPLES_PER_CHAR_HINT * 2)
+        position = 0
+        chunk_count = 0
+
+        for chunk in voice.synthesize(text):
+            if hasattr(chunk, 'audio_int16_bytes'):
+                data = chunk.audio_int16_bytes
+                end = position + len(data)
+                if end > len(audio_data):
+                    audio_data.extend(bytes(end - len(audio_data)))
+                audio_data[position:end] = data
+                position = end
+                chunk_count += 1
+            else:
+                self.logger.warning(f"Chunk sans audio_int16_bytes: {type(chunk)}, attributs: {dir(chunk)}")
+
+        # Libérer la partie non utilisée du tampon
+        del audio_data[position:]
+        return audio_data, chunk_count
+
+    async def _synthesize_with_command(self, text: str) -> Optional[Tuple[np.ndarray, int]]:
         """Synthèse avec la commande piper"""
+        output_file = self._next_output_file()
         try:
             # Préparer la commande
             cmd = [
@@ -276,53 +605,144 @@ class GLaDOSTTSOutput(OutputModule):
             
             stdout, stderr = await process.communicate(input=text.encode())
             
-            if process.returncode == 0:
-                return True
-            else:
+            if process.returncode != 0:
                 self.logger.error(f"Erreur commande piper: {stderr.decode()}")
-                return False
+                return None
+
+            # La commande écrit forcément un WAV : le relire une seule fois
+            with wave.open(str(output_file), 'rb') as wf:
+                sample_rate = wf.getframerate()
+                frames = wf.readframes(wf.getnframes())
+
+            return np.frombuffer(frames, dtype=np.int16), sample_rate
                 
         except Exception as e:
             self.logger.error(f"Erreur synthèse commande: {e}")
+            return None
+
+        finally:
+            try:
+                output_file.unlink(missing_ok=True)
+            except Exception as cleanup_error:
+                self.logger.warning(f"Impossible de supprimer le fichier temporaire {output_file}: {cleanup_error}")
+
+    async def _speak_streaming(self, text: str) -> bool:
+        """
+        Synthétise et joue le texte fenêtre par fenêtre avec le modèle découpé.
+        Si aucune fenêtre n'a pu être jouée, le texte est synthétisé d'un bloc
+        """
+        chunks = self._decode_split_model(text)
+        frame_count = 0
+        try:
+            while written := await asyncio.to_thread(self._write_next_chunk, chunks):
+                frame_count += written
+        except Exception as e:
+            if frame_count:
+                # Début déjà joué : le reprendre répéterait l'audio
+                self.logger.error(f"Synthèse streaming interrompue après {frame_count} échantillons: {e}")
+                return False
+            self.logger.warning(f"Synthèse streaming impossible, synthèse complète: {e}")
+
+        if frame_count:
+            self.logger.info(f"Audio GLaDOS joué en streaming ({frame_count} échantillons)")
+            return True
+
+        # Rien n'a été joué : synthèse monolithique
+        synthesis = await self._synthesize_text(text)
+        if synthesis is None:
             return False
+        return await self._play_audio(*synthesis)
+
+    def _write_next_chunk(self, chunks: Iterator[np.ndarray]) -> int:
+        """Décode la fenêtre suivante et l'écrit dans le flux (bloquant) ; 0 en fin de texte"""
+        chunk = next(chunks, None)
+        if chunk is None:
+            return 0
+        self._stream.write(chunk)
+        return len(chunk)
+
+    def _decode_split_model(self, text: str) -> Iterator[np.ndarray]:
+        """
+        Exécute l'encodeur une fois par phrase puis le décodeur par fenêtres
+        de latents, et produit l'audio int16 de chaque fenêtre (non vide).
+        Chaque fenêtre est décodée avec decoder_overlap_frames de contexte de chaque
+        côté, retiré ensuite, et le rééchantillonnage garde son état d'une fenêtre à l'autre.
+        Le gain est fixe (decoder_gain), sans normalisation par phrase
+        """
+        voice = self.voice
+        config = voice.config
+        sample_rate = config.sample_rate
+        scales = np.array([
+            getattr(config, 'noise_scale', 0.667),
+            getattr(config, 'length_scale', 1.0),
+            getattr(config, 'noise_w_scale', getattr(config, 'noise_w', 0.8))
+        ], dtype=np.float32)
+
+        z_name, mask_name = DECODER_INPUT_NAMES
+        chunk_frames = self.decoder_chunk_frames
+        overlap = self.decoder_overlap_frames
+        gain = np.float32(32767.0 * self.volume * self.decoder_gain)
+
+        for phonemes in voice.phonemize(text):
+            phoneme_ids = np.array([voice.phonemes_to_ids(phonemes)], dtype=np.int64)
+            phoneme_lengths = np.array([phoneme_ids.shape[1]], dtype=np.int64)
+
+            # Encodeur : phonèmes -> latents z (+ masque)
+            z, y_mask = self._encoder_session.run(list(DECODER_INPUT_NAMES), dict(zip(
+                ENCODER_INPUT_NAMES, (phoneme_ids, phoneme_lengths, scales)
+            )))
+
+            # Un rééchantillonneur par phrase, alimenté fenêtre par fenêtre
+            resampler = None
+            if sample_rate != self.sample_rate:
+                resampler = _StreamingResampler(sample_rate, self.sample_rate)
+
+            # Décodeur : fenêtres de latents -> audio joué au fil de l'eau
+            total_frames = z.shape[2]
+            for start in range(0, total_frames, chunk_frames):
+                end = min(start + chunk_frames, total_frames)
+                context_start = max(0, start - overlap)
+                context_end = min(total_frames, end + overlap)
+                audio = self._decoder_session.run(None, {
+                    z_name: z[:, :, context_start:context_end],
+                    mask_name: y_mask[:, :, context_start:context_end]
+                })[0].reshape(-1)
+
+                # Garder uniquement la partie centrale de la fenêtre
+                hop = len(audio) // (context_end - context_start)
+                audio = audio[(start - context_start) * hop:(end - context_start) * hop] * gain
+                if resampler is not None:
+                    audio = resampler.process(audio, final=end == total_frames)
+
+                if len(audio):
+                    np.clip(audio, -32768, 32767, out=audio)
+                    yield audio.astype(np.int16)
+
+    def _save_wav(self, samples: np.ndarray, sample_rate: int, output_file: Path) -> None:
+        """Écrit des échantillons int16 dans un fichier WAV (tampon de 1 Mio)"""
+        with open(output_file, "wb", buffering=WAV_WRITE_BUFFER_SIZE) as raw_file, \
+                wave.open(raw_file, "wb") as wav_file:
+            wav_file.setframerate(sample_rate)
+            wav_file.setsampwidth(2)  # 16-bit
+            wav_file.setnchannels(1)  # mono
+            wav_file.writeframes(samples.tobytes())
     
-    async def _play_audio(self, audio_file: Path) -> bool:
+    async def _play_audio(self, audio_data: np.ndarray, sample_rate: int) -> bool:
         """
-        Joue un fichier audio
+        Joue des échantillons audio int16
         """
         try:
-            # Lire le fichier WAV
-            with wave.open(str(audio_file), 'rb') as wf:
-                sample_rate = wf.getframerate()
-                frames = wf.readframes(wf.getnframes())
-                
-                # Convertir en numpy array
-                audio_data = np.frombuffer(frames, dtype=np.int16)
-                
-                # Normaliser et ajuster le volume
-                audio_data = audio_data.astype(np.float32) / 32768.0
-                audio_data *= self.volume
-
-                # Vérifier la validité du device
-                device_id = self.device_id
-                try:
-                    sd.check_output_settings(device=device_id)
-                except Exception as e:
-                    self.logger.warning(f"Device {device_id} non disponible, utilisation du device par défaut. Erreur: {e}")
-                    device_id = None
-                # Resampling si nécessaire
-                target_sample_rate = self.sample_rate
-                if sample_rate != target_sample_rate:
-                    self.logger.info(f"Resampling de {sample_rate} Hz vers {target_sample_rate} Hz")
-                    # Simple resampling linéaire
-                    import scipy.signal
-                    num_samples = int(len(audio_data) * target_sample_rate / sample_rate)
-                    audio_data = scipy.signal.resample(audio_data, num_samples)
-                    sample_rate = target_sample_rate
+            # Volume et resampling vers la fréquence de sortie
+            if sample_rate != self.sample_rate:
+                self.logger.info(f"Resampling de {sample_rate} Hz vers {self.sample_rate} Hz")
 
-                # Jouer l'audio
-                sd.play(audio_data, samplerate=sample_rate, device=device_id)
-                sd.wait()  # Attendre la fin de la lecture
+            # Préparer et jouer l'audio sans bloquer la boucle d'événements
+            if self._stream is not None:
+                await asyncio.to_thread(self._write_audio, audio_data, sample_rate)
+            else:
+                audio_data = await asyncio.to_thread(self._prepare_audio, audio_data, sample_rate)
+                sd.play(audio_data, samplerate=self.sample_rate, device=self.device_id)
+                await asyncio.to_thread(sd.wait)  # Attendre la fin de la lecture
             
             self.logger.info("Audio GLaDOS joué avec succès")
             return True
@@ -331,6 +751,33 @@ class GLaDOSTTSOutput(OutputModule):
             self.logger.error(f"Erreur lecture audio: {e}")
             return False
     
+    def _write_audio(self, audio_data: np.ndarray, sample_rate: int) -> None:
+        """Prépare (volume, resampling) puis écrit l'audio sur le flux, dans un thread"""
+        self._stream.write(self._prepare_audio(audio_data, sample_rate))
+
+    def _prepare_audio(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Applique le volume et rééchantillonne vers la fréquence de sortie (int16)"""
+        # Resampling polyphase d'un signal complet (le streaming utilise _StreamingResampler)
+        if sample_rate != self.sample_rate:
+            import scipy.signal
+            # Conversion float32 et volume en une seule passe vectorisée
+            audio_f32 = np.empty(audio_data.shape, dtype=np.float32)
+            np.multiply(audio_data, np.float32(self.volume), out=audio_f32, casting='unsafe')
+            factor = math.gcd(self.sample_rate, sample_rate)
+            resampled = scipy.signal.resample_poly(
+                audio_f32, self.sample_rate // factor, sample_rate // factor
+            )
+            np.clip(resampled, -32768, 32767, out=resampled)
+            return resampled.astype(np.int16)
+
+        # Sans resampling : ajuster le volume en arithmétique entière (gain Q15)
+        if self.volume != 1.0:
+            gain = int(round(self.volume * 32767))
+            scaled = (audio_data.astype(np.int32) * gain) >> 15
+            audio_data = np.clip(scaled, -32768, 32767).astype(np.int16)
+
+        return audio_data
+
     def can_handle_message_type(self, message_type: MessageType) -> bool:
         """Vérifie si ce module peut traiter ce type de message"""
         return message_type in [MessageType.TEXT, MessageType.ERROR]
@@ -338,6 +785,17 @@ class GLaDOSTTSOutput(OutputModule):
     async def cleanup(self) -> None:
         """Nettoie les ressources (garde le dossier cache permanent)"""
         self.is_active = False
+        self._audio_cache.clear()
+        self._audio_cache_bytes = 0
+
+        # Fermer le flux audio persistant
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                self.logger.warning(f"Erreur fermeture flux audio: {e}")
+            self._stream = None
 
         # Nettoyer seulement les fichiers audio, pas le dossier cache
         if self.temp_dir and self.temp_dir.exists():
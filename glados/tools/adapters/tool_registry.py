@@ -4,10 +4,15 @@ Enregistre automatiquement tous les adaptateurs d'outils
 """
 
 from ...core.factories import ToolAdapterFactory
-from ..tapo.tapo_adapter import TapoAdapter
-from ..ir_osram.ir_osram_adapter import IROsramAdapter
-from ..ir_yamaha.ir_yamaha_adapter import IRYamahaAdapter
-from ..weather.weather_adapter import WeatherAdapter
+
+
+# Adaptateurs disponibles : (module, classe) importés seulement à la création de l'outil
+_ADAPTERS = {
+    'tapo': ('glados.tools.tapo.tapo_adapter', 'TapoAdapter'),
+    'ir_osram': ('glados.tools.ir_osram.ir_osram_adapter', 'IROsramAdapter'),
+    'ir_yamaha': ('glados.tools.ir_yamaha.ir_yamaha_adapter', 'IRYamahaAdapter'),
+    'weather': ('glados.tools.weather.weather_adapter', 'WeatherAdapter'),
+}
 
 
 def register_all_tools():
@@ -15,17 +20,8 @@ def register_all_tools():
     Enregistre tous les adaptateurs d'outils disponibles
     Appelé au démarrage de GLaDOS
     """
-    # Enregistrer l'adaptateur Tapo
-    ToolAdapterFactory.register('tapo', TapoAdapter)
-
-    # Enregistrer l'adaptateur IR OSRAM
-    ToolAdapterFactory.register('ir_osram', IROsramAdapter)
-
-    # Enregistrer l'adaptateur IR Yamaha
-    ToolAdapterFactory.register('ir_yamaha', IRYamahaAdapter)
-
-    # Enregistrer l'adaptateur météo
-    ToolAdapterFactory.register('weather', WeatherAdapter)
+    for tool_type, adapter_path in _ADAPTERS.items():
+        ToolAdapterFactory.register(tool_type, adapter_path)
     
     print(f"Outils enregistrés: {ToolAdapterFactory.get_available_types()}")
 
@@ -48,4 +44,4 @@ class ToolRegistry:
     @staticmethod
     def create_tool(tool_type: str, name: str, config: dict):
         """Crée une instance d'outil"""
-        return ToolAdapterFactory.create(tool_type, name, config)
\ No newline at end of file
+        return ToolAdapterFactory.create(tool_type, name, config)
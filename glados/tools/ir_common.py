@@ -0,0 +1,303 @@
+"""
+Fonctions communes aux adaptateurs IR (OSRAM, Yamaha)
+Timing NEC, formes d'onde lgpio, pilote LIRC et validation mise en cache des paramètres
+"""
+
+import os
+import struct
+import time
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+
+# Priorité temps réel (SCHED_FIFO) du thread d'émission IR
+IR_RT_PRIORITY = 50
+
+# Porteuse IR : fréquence (Hz) et rapport cyclique
+CARRIER_FREQ = 38000
+DUTY_CYCLE = 0.33
+
+# Période NEC entre le début de deux trames (µs) et code de répétition standard
+NEC_FRAME_PERIOD_US = 108000
+NEC_REPEAT_PULSES = (9000, 2250, 560)
+
+# Impulsions NEC (µs) d'un bit 0 et d'un bit 1
+NEC_BIT0 = (560, 560)
+NEC_BIT1 = (560, 1690)
+
+# Attente hybride : sommeil au-delà du seuil, attente active sur la marge finale
+# (la marge couvre le retard de réveil de time.sleep)
+SLEEP_THRESHOLD_NS = 1_000_000
+SPIN_MARGIN_NS = 300_000
+
+# ioctl LIRC (linux/lirc.h) : _IOW('i', 0x13 / 0x15, __u32)
+LIRC_SET_SEND_CARRIER = 0x40046913
+LIRC_SET_SEND_DUTY_CYCLE = 0x40046915
+
+# Durée maximale d'une écriture LIRC (IR_MAX_DURATION du noyau, µs) : au-delà,
+# write() échoue avec EINVAL
+LIRC_MAX_DURATION_US = 500_000
+
+# Pause minimale (µs) considérée comme un intervalle entre trames NEC (seuls points
+# de découpe d'une séquence LIRC) ; la plus longue pause interne d'une trame est 4,5 ms
+FRAME_GAP_MIN_US = 20_000
+
+# Modes d'émission : pilote noyau LIRC, forme d'onde planifiée par lgpio (tx_wave,
+# non validée sur matériel) ou bit-bang Python
+IR_BACKENDS = ('lirc', 'tx_wave', 'bitbang')
+
+# Horloge monotone (insensible aux ajustements NTP) liée une fois
+now_ns = time.monotonic_ns
+
+
+def ir_backend(config: dict) -> str:
+    """
+    Mode d'émission configuré (ir_backend) : 'lirc' par défaut si lirc_device est
+    défini, sinon 'bitbang'. tx_wave doit être choisi explicitement
+    """
+    backend = config.get('ir_backend') or ('lirc' if config.get('lirc_device') else 'bitbang')
+    if backend not in IR_BACKENDS:
+        raise ValueError(f"ir_backend invalide: '{backend}'. Valeurs possibles: {list(IR_BACKENDS)}")
+    if backend == 'lirc' and not config.get('lirc_device'):
+        raise ValueError("ir_backend 'lirc' requiert lirc_device")
+    return backend
+
+
+def wait_until(target_ns: int):
+    """Attend l'échéance (ns, horloge now_ns) : sommeil pour les longues pauses, puis attente active"""
+    # Longues pauses (AGC, intervalle de répétition) : libère le CPU
+    remaining_ns = target_ns - now_ns()
+    if remaining_ns > SLEEP_THRESHOLD_NS:
+        time.sleep((remaining_ns - SPIN_MARGIN_NS) / 1e9)
+
+    while now_ns() < target_ns:
+        pass
+
+
+def with_repeats(pulses: tuple, repeat_count: int) -> tuple:
+    """
+    Ajoute à la trame les codes de répétition NEC, chacun démarrant une période
+    NEC après le précédent, pour former une seule séquence ON/OFF
+    """
+    sequence = list(pulses)
+    previous = sum(pulses)
+    repeat_duration = sum(NEC_REPEAT_PULSES)
+    for _ in range(repeat_count):
+        sequence.append(NEC_FRAME_PERIOD_US - previous)  # Pause OFF
+        sequence.extend(NEC_REPEAT_PULSES)
+        previous = repeat_duration
+    return tuple(sequence)
+
+
+def encoded(cache: dict, encode, key, pulses: tuple, repeat_count: int):
+    """
+    Séquence encodée (trame + codes de répétition) pour un mode d'émission,
+    mise en cache par (clé de commande, répétitions)
+    """
+    cache_key = (key, repeat_count)
+    sequence = cache.get(cache_key)
+    if sequence is None:
+        sequence = cache[cache_key] = encode(with_repeats(pulses, repeat_count))
+    return sequence
+
+
+def build_schedule(pulses: tuple) -> tuple:
+    """
+    Sépare une séquence ON/OFF en deux tableaux parallèles : durées des
+    impulsions ON (µs) et échéances de fin de chaque pause (ns depuis le début)
+    """
+    # Pause nulle après la dernière impulsion : autant de pauses que d'impulsions
+    padded = pulses + (0,)
+    marks = array('I', padded[0::2])
+    space_ends = array('Q', accumulate(duration * 1000 for duration in padded))[1::2]
+    return marks, space_ends
+
+
+def send_ir_burst(write, handle: int, pin: int, duration_us: int):
+    """
+    Génère en bit-bang une rafale IR modulée à 38kHz (write: lgpio.gpio_write),
+    chaque demi-cycle calé sur son échéance ; la broche finit à 0
+    """
+    # Durées entières en ns calculées hors de la boucle
+    period_ns = 1_000_000_000 // CARRIER_FREQ
+    on_time_ns = int(period_ns * DUTY_CYCLE)
+    cycles = duration_us * 1000 // period_ns
+
+    wait = wait_until
+    start_time = now_ns()
+
+    for cycle in range(cycles):
+        cycle_start = start_time + cycle * period_ns
+        write(handle, pin, 1)
+        wait(cycle_start + on_time_ns)
+
+        write(handle, pin, 0)
+        wait(cycle_start + period_ns)
+
+
+def send_ir_signal(handle: int, pin: int, schedule: tuple):
+    """Émet en bit-bang une séquence issue de build_schedule avec timing précis"""
+    import lgpio
+
+    try:
+        marks, space_ends = schedule
+        # Références locales : pas de recherche globale/attribut par impulsion
+        write = lgpio.gpio_write
+        burst = send_ir_burst
+        wait = wait_until
+
+        start_time = now_ns()
+
+        for mark_us, space_end_ns in zip(marks, space_ends):
+            burst(write, handle, pin, mark_us)
+            write(handle, pin, 0)
+            wait(start_time + space_end_ns)
+
+        write(handle, pin, 0)
+
+    except Exception as e:
+        raise RuntimeError(f"Erreur lors de l'envoi IR: {e}")
+
+
+def raise_priority() -> bool:
+    """
+    Élève la priorité du thread appelant : ordonnancement temps réel SCHED_FIFO
+    si permis, sinon nice(-10). Retourne False si aucune élévation n'est possible
+    """
+    if hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(IR_RT_PRIORITY))
+            return True
+        except OSError:
+            pass
+
+    try:
+        os.nice(-10)  # Priorité plus haute
+        return True
+    except OSError:
+        return False
+
+
+def build_wave(pulses: tuple) -> list:
+    """Construit la forme d'onde lgpio d'une séquence NEC avec la porteuse 38kHz incluse"""
+    import lgpio
+
+    period_us = round(1000000 / CARRIER_FREQ)
+    on_time_us = round(period_us * DUTY_CYCLE)
+
+    # Les deux impulsions d'un cycle de porteuse sont créées une fois et
+    # référencées par tous les cycles
+    carrier_cycle = (lgpio.pulse(1, 1, on_time_us), lgpio.pulse(0, 1, period_us - on_time_us))
+
+    wave = []
+    remainder = 0
+    for i, duration in enumerate(pulses):
+        if i % 2 == 0:  # Impulsion ON : cycles de porteuse entiers
+            cycles, remainder = divmod(duration, period_us)
+            wave.extend(carrier_cycle * cycles)
+        else:  # Pause OFF, allongée du reste de l'impulsion : échéances de trame conservées
+            wave.append(lgpio.pulse(0, 1, duration + remainder))
+            remainder = 0
+
+    return wave
+
+
+def send_wave(handle: int, pin: int, wave: list):
+    """Soumet la forme d'onde à lgpio en une fois et attend la fin de l'émission"""
+    import lgpio
+
+    try:
+        lgpio.tx_wave(handle, pin, wave)
+        while lgpio.tx_busy(handle, pin, lgpio.TX_WAVE):
+            time.sleep(0.005)
+        lgpio.gpio_write(handle, pin, 0)
+    except Exception as e:
+        raise RuntimeError(f"Erreur lors de l'envoi IR: {e}")
+
+
+def open_lirc(lirc_device: str) -> int:
+    """Ouvre le périphérique LIRC, configure la porteuse et retourne le descripteur"""
+    import fcntl
+
+    fd = None
+    try:
+        fd = os.open(lirc_device, os.O_RDWR)
+        fcntl.ioctl(fd, LIRC_SET_SEND_CARRIER, struct.pack('I', CARRIER_FREQ))
+        fcntl.ioctl(fd, LIRC_SET_SEND_DUTY_CYCLE, struct.pack('I', round(DUTY_CYCLE * 100)))
+    except Exception as e:
+        if fd is not None:
+            os.close(fd)
+        raise RuntimeError(f"Erreur d'initialisation LIRC ({lirc_device}): {e}")
+    return fd
+
+
+def pack_lirc(pulses: tuple) -> tuple:
+    """
+    Sérialise une séquence ON/OFF (µs) pour le pilote LIRC, découpée aux pauses entre
+    trames en écritures d'au plus LIRC_MAX_DURATION_US : ((tampon, pause suivante ns), ...)
+    """
+    # Trames séparées par les intervalles de répétition : (impulsions, pause suivante µs)
+    segments = []
+    current = []
+    for i, duration in enumerate(pulses):
+        if i % 2 and duration >= FRAME_GAP_MIN_US:
+            segments.append((current, duration))
+            current = []
+        else:
+            current.append(duration)
+    segments.append((current, 0))
+
+    # Regroupement des trames consécutives tant que l'écriture reste sous la limite
+    chunks = []
+    chunk = []
+    chunk_duration = 0
+    gap = 0
+    for segment, next_gap in segments:
+        segment_duration = sum(segment)
+        if chunk and chunk_duration + gap + segment_duration > LIRC_MAX_DURATION_US:
+            chunks.append((struct.pack(f'{len(chunk)}I', *chunk), gap * 1000))
+            chunk = []
+            chunk_duration = 0
+        elif chunk:
+            chunk.append(gap)
+            chunk_duration += gap
+        chunk.extend(segment)
+        chunk_duration += segment_duration
+        gap = next_gap
+    chunks.append((struct.pack(f'{len(chunk)}I', *chunk), 0))
+
+    return tuple(chunks)
+
+
+def send_lirc(fd: int, chunks: tuple):
+    """
+    Écrit une séquence issue de pack_lirc sur le périphérique LIRC : chaque write()
+    bloque jusqu'à la fin de son émission, puis la pause retirée est attendue
+    """
+    for buffer, gap_ns in chunks:
+        try:
+            os.write(fd, buffer)
+        except OSError as e:
+            raise RuntimeError(f"Erreur lors de l'envoi IR: {e}")
+        if gap_ns:
+            wait_until(now_ns() + gap_ns)
+
+
+def cached_validator(model, *field_names):
+    """
+    Valideur d'un modèle Pydantic mis en cache par valeurs de paramètres (peu de
+    combinaisons possibles, et la validation ne dépend que des paramètres).
+    Les valeurs sont passées dans l'ordre de field_names
+    """
+    @lru_cache(maxsize=256, typed=True)
+    def cached(*values):
+        return model(**dict(zip(field_names, values)))
+
+    def validate(*values):
+        try:
+            return cached(*values)
+        except TypeError:
+            # Valeur non hachable (ex: liste) : validation directe, qui lève l'erreur Pydantic
+            return model(**dict(zip(field_names, values)))
+
+    return validate
@@ -7,12 +7,20 @@ import asyncio
 import os
 import platform
 import time
-from typing import Dict, Any, Union, Literal
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Literal
 import logging
 from pydantic import BaseModel, Field, model_validator
 from enum import Enum
+from itertools import chain
 
 from ...core.interfaces import ToolAdapter
+from ..ir_common import (
+    build_schedule, build_wave, cached_validator, encoded, ir_backend, open_lirc, pack_lirc,
+    raise_priority, send_ir_signal, send_lirc, send_wave, CARRIER_FREQ, DUTY_CYCLE,
+    NEC_BIT0, NEC_BIT1
+)
 
 # Vérification de la plateforme
 IS_RASPBERRY_PI = platform.machine().startswith('arm') or platform.machine().startswith('aarch64')
@@ -27,6 +35,12 @@ if IS_RASPBERRY_PI:
 else:
     LGPIO_AVAILABLE = False
 
+# Disponibilité de l'émission IR, évaluée une seule fois à l'import
+_IR_READY = IS_RASPBERRY_PI and LGPIO_AVAILABLE
+
+# Délai (s) avant une nouvelle ouverture du GPIO après un échec d'initialisation
+REMOTE_RETRY_DELAY = 30.0
+
 
 class OsramCommand(str, Enum):
     """Commandes IR OSRAM RGBW disponibles"""
@@ -81,11 +95,11 @@ class OsramAction(str, Enum):
     EFFECT = "effect"
 
 
-# Mappage des commandes par catégorie d'action
+# Mappage des commandes par catégorie d'action (ensembles figés, appartenance en O(1))
 COMMAND_ACTIONS = {
-    OsramAction.POWER: [OsramCommand.ON, OsramCommand.OFF],
-    OsramAction.BRIGHTNESS: [OsramCommand.BRIGHT_UP, OsramCommand.BRIGHT_DOWN],
-    OsramAction.COLOR: [
+    OsramAction.POWER: frozenset({OsramCommand.ON, OsramCommand.OFF}),
+    OsramAction.BRIGHTNESS: frozenset({OsramCommand.BRIGHT_UP, OsramCommand.BRIGHT_DOWN}),
+    OsramAction.COLOR: frozenset({
         OsramCommand.RED, OsramCommand.GREEN, OsramCommand.BLUE, OsramCommand.WHITE,
         OsramCommand.RED1, OsramCommand.GREEN1, OsramCommand.BLUE1,
         OsramCommand.RED2, OsramCommand.GREEN2, OsramCommand.BLUE2,
@@ -94,12 +108,12 @@ COMMAND_ACTIONS = {
         OsramCommand.ORANGE, OsramCommand.CYAN, OsramCommand.PURPLE,
         OsramCommand.YELLOW, OsramCommand.PINK, OsramCommand.LIME,
         OsramCommand.VIOLET, OsramCommand.MAGENTA
-    ],
-    OsramAction.EFFECT: [OsramCommand.FLASH, OsramCommand.STROBE, OsramCommand.SMOOTH, OsramCommand.MODE]
+    }),
+    OsramAction.EFFECT: frozenset({OsramCommand.FLASH, OsramCommand.STROBE, OsramCommand.SMOOTH, OsramCommand.MODE})
 }
 
-# Mappage des aliases pour rétrocompatibilité
-OSRAM_ALIASES = {
+# Mappage des aliases pour rétrocompatibilité (lecture seule)
+OSRAM_ALIASES = types.MappingProxyType({
     'power_on': OsramCommand.ON,
     'power_off': OsramCommand.OFF,
     'power': OsramCommand.ON,
@@ -116,153 +130,88 @@ OSRAM_ALIASES = {
     'blink': OsramCommand.FLASH,
     'stroboscope': OsramCommand.STROBE,
     'gradual': OsramCommand.SMOOTH
-}
-
-
-# Modèles Pydantic stricts pour chaque type d'action
-class OsramBaseParameters(BaseModel):
-    """Paramètres de base pour toutes les actions OSRAM IR"""
-
-    @model_validator(mode='after')
-    def validate_raspberry_pi(self):
-        """Valide que le système est un Raspberry Pi avec lgpio disponible"""
-        if not IS_RASPBERRY_PI:
-            raise ValueError(
-                "Contrôle IR OSRAM disponible uniquement sur Raspberry Pi. "
-                f"Plateforme détectée: {platform.machine()}"
-            )
-
-        if not LGPIO_AVAILABLE:
-            raise ValueError(
-                "Module lgpio requis non disponible. Installez avec: sudo apt install python3-lgpio"
-            )
-
-        return self
-
-
-class OsramPowerParameters(OsramBaseParameters):
-    """Paramètres pour le contrôle d'alimentation OSRAM"""
-    action: OsramAction = Field(default=OsramAction.POWER, description="Contrôle de l'alimentation")
-    command: OsramCommand = Field(description="Commande d'alimentation: on ou off")
-    repeat_count: int = Field(
-        default=0,
-        ge=0,
-        le=5,
-        description="Nombre de répétitions du signal (0-5)"
+})
+
+# Couleurs nommées sans code propre, émises avec le code NEC le plus proche
+_COLOR_ALIAS_REMAP = types.MappingProxyType({
+    'ORANGE': 'RED1',
+    'PURPLE': 'RED2',
+    'PINK': 'RED3',
+    'MAGENTA': 'RED4',
+    'CYAN': 'BLUE1',
+    'YELLOW': 'GREEN2',
+    'LIME': 'GREEN3'
+})
+
+# Adresse NEC des ampoules OSRAM
+OSRAM_ADDRESS = 0x00
+
+# Codes de commandes OSRAM (du script original), en lecture seule
+OSRAM_COMMANDS = types.MappingProxyType({
+    'ON': 0x07,
+    'OFF': 0x06,
+    'BRIGHT_UP': 0x00,
+    'BRIGHT_DOWN': 0x02,
+    'RED': 0x08,
+    'GREEN': 0x09,
+    'BLUE': 0x0A,
+    'WHITE': 0x03,
+    'RED1': 0x0C,
+    'GREEN1': 0x0D,
+    'BLUE1': 0x0E,
+    'FLASH': 0x0F,
+    'RED2': 0x10,
+    'GREEN2': 0x11,
+    'BLUE2': 0x12,
+    'STROBE': 0x13,
+    'RED3': 0x14,
+    'GREEN3': 0x15,
+    'BLUE3': 0x16,
+    'SMOOTH': 0x17,
+    'RED4': 0x18,
+    'GREEN4': 0x19,
+    'BLUE4': 0x1A,
+    'MODE': 0x1B
+})
+
+def _build_nec_pulses(address: int, command: int) -> tuple:
+    """Construit la trame NEC complète (71 impulsions) d'une commande"""
+    # Address, ~Address, Command, ~Command regroupés en un mot de 32 bits (LSB first)
+    packed = (
+        address
+        | (((~address) & 0xFF) << 8)
+        | (command << 16)
+        | (((~command) & 0xFF) << 24)
     )
 
-    @model_validator(mode='after')
-    def validate_power_command(self):
-        """Valide que la commande est bien une commande d'alimentation"""
-        super().validate_raspberry_pi()
-
-        if self.command not in COMMAND_ACTIONS[OsramAction.POWER]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[OsramAction.POWER]]
-            raise ValueError(
-                f"Commande '{self.command}' invalide pour l'action 'power'. "
-                f"Commandes valides: {valid_commands}"
-            )
-        return self
-
+    data = [9000, 4500]  # AGC burst: 9ms ON, 4.5ms OFF
+    data.extend(chain.from_iterable(NEC_BIT1 if (packed >> i) & 1 else NEC_BIT0 for i in range(32)))
 
-class OsramBrightnessParameters(OsramBaseParameters):
-    """Paramètres pour le contrôle de luminosité OSRAM"""
-    action: OsramAction = Field(default=OsramAction.BRIGHTNESS, description="Contrôle de la luminosité")
-    command: OsramCommand = Field(description="Commande de luminosité: bright_up ou bright_down")
-    repeat_count: int = Field(
-        default=1,
-        ge=1,
-        le=10,
-        description="Nombre de répétitions pour ajuster l'intensité (1-10)"
-    )
+    # Stop bit puis complément à 71 impulsions
+    data.append(560)
+    data.extend([560] * (71 - len(data)))
 
-    @model_validator(mode='after')
-    def validate_brightness_command(self):
-        """Valide que la commande est bien une commande de luminosité"""
-        super().validate_raspberry_pi()
-
-        if self.command not in COMMAND_ACTIONS[OsramAction.BRIGHTNESS]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[OsramAction.BRIGHTNESS]]
-            raise ValueError(
-                f"Commande '{self.command}' invalide pour l'action 'brightness'. "
-                f"Commandes valides: {valid_commands}"
-            )
-        return self
+    return tuple(data)
 
 
-class OsramColorParameters(OsramBaseParameters):
-    """Paramètres pour le contrôle de couleur OSRAM"""
-    action: OsramAction = Field(default=OsramAction.COLOR, description="Contrôle de la couleur")
-    command: OsramCommand = Field(description="Commande de couleur (red, green, blue, white, etc.)")
-    repeat_count: int = Field(
-        default=0,
-        ge=0,
-        le=3,
-        description="Nombre de répétitions pour maintenir la couleur (0-3)"
-    )
-
-    @model_validator(mode='after')
-    def validate_color_command(self):
-        """Valide que la commande est bien une commande de couleur"""
-        super().validate_raspberry_pi()
-
-        if self.command not in COMMAND_ACTIONS[OsramAction.COLOR]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[OsramAction.COLOR]]
-            raise ValueError(
-                f"Commande '{self.command}' invalide pour l'action 'color'. "
-                f"Commandes valides: {valid_commands}"
-            )
-        return self
-
-
-class OsramEffectParameters(OsramBaseParameters):
-    """Paramètres pour les effets lumineux OSRAM"""
-    action: OsramAction = Field(default=OsramAction.EFFECT, description="Effets lumineux")
-    command: OsramCommand = Field(description="Commande d'effet: flash, strobe, smooth, mode")
-    repeat_count: int = Field(
-        default=0,
-        ge=0,
-        le=2,
-        description="Nombre de répétitions pour activer l'effet (0-2)"
-    )
-
-    @model_validator(mode='after')
-    def validate_effect_command(self):
-        """Valide que la commande est bien une commande d'effet"""
-        super().validate_raspberry_pi()
-
-        if self.command not in COMMAND_ACTIONS[OsramAction.EFFECT]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[OsramAction.EFFECT]]
-            raise ValueError(
-                f"Commande '{self.command}' invalide pour l'action 'effect'. "
-                f"Commandes valides: {valid_commands}"
-            )
-        return self
-
-
-# Union des paramètres OSRAM pour la validation
-OsramParameters = Union[
-    OsramPowerParameters,
-    OsramBrightnessParameters,
-    OsramColorParameters,
-    OsramEffectParameters
-]
+# Trames NEC précalculées pour chaque code (adresse OSRAM fixe)
+_PULSE_CACHE = {
+    code: _build_nec_pulses(OSRAM_ADDRESS, code) for code in set(OSRAM_COMMANDS.values())
+}
 
+# Mêmes trames indexées par nom de commande (aliases de couleur inclus) :
+# une seule recherche à l'envoi
+_PULSES_BY_NAME = types.MappingProxyType({
+    **{name: _PULSE_CACHE[code] for name, code in OSRAM_COMMANDS.items()},
+    **{alias: _PULSE_CACHE[OSRAM_COMMANDS[name]] for alias, name in _COLOR_ALIAS_REMAP.items()}
+})
 
-def validate_osram_parameters(params_dict: Dict[str, Any]) -> Union[OsramPowerParameters, OsramBrightnessParameters, OsramColorParameters, OsramEffectParameters]:
-    """Valide et retourne les paramètres selon l'action"""
-    action = params_dict.get('action')
 
-    if action == 'power':
-        return OsramPowerParameters(**params_dict)
-    elif action == 'brightness':
-        return OsramBrightnessParameters(**params_dict)
-    elif action == 'color':
-        return OsramColorParameters(**params_dict)
-    elif action == 'effect':
-        return OsramEffectParameters(**params_dict)
-    else:
-        raise ValueError(f"Action '{action}' non supportée. Actions valides: power, brightness, color, effect")
+# Séquences encodées par mode d'émission, construites au premier envoi et
+# partagées par toutes les instances : (commande, répétitions) -> séquence
+_WAVES = {}
+_SCHEDULES = {}
+_LIRC_FRAMES = {}
 
 
 class OsramRGBWRemote:
@@ -271,42 +220,30 @@ class OsramRGBWRemote:
     Adaptée du script original pour intégration dans GLaDOS
     """
 
-    def __init__(self, ir_pin: int = 19):
+    def __init__(self, ir_pin: int = 19, lirc_device: str = None, use_tx_wave: bool = False):
         self.ir_pin = ir_pin
         self.h = None
-        self.OSRAM_ADDRESS = 0x00
-
-        # Codes de commandes OSRAM (du script original)
-        self.commands = {
-            'ON': 0x07,
-            'OFF': 0x06,
-            'BRIGHT_UP': 0x00,
-            'BRIGHT_DOWN': 0x02,
-            'RED': 0x08,
-            'GREEN': 0x09,
-            'BLUE': 0x0A,
-            'WHITE': 0x03,
-            'RED1': 0x0C,
-            'GREEN1': 0x0D,
-            'BLUE1': 0x0E,
-            'FLASH': 0x0F,
-            'RED2': 0x10,
-            'GREEN2': 0x11,
-            'BLUE2': 0x12,
-            'STROBE': 0x13,
-            'RED3': 0x14,
-            'GREEN3': 0x15,
-            'BLUE3': 0x16,
-            'SMOOTH': 0x17,
-            'RED4': 0x18,
-            'GREEN4': 0x19,
-            'BLUE4': 0x1A,
-            'MODE': 0x1B
-        }
+        self.lirc_fd = None
+        self.OSRAM_ADDRESS = OSRAM_ADDRESS
 
         # Optimisations timing
-        self.carrier_freq = 38000
-        self.duty_cycle = 0.33
+        self.carrier_freq = CARRIER_FREQ
+        self.duty_cycle = DUTY_CYCLE
+
+        # Priorité du thread d'émission, élevée une seule fois au premier envoi
+        self._elevated = None
+
+        # Pilote noyau gpio-ir-tx ou pwm-ir-tx (porteuse par le PWM matériel) :
+        # une trame complète par write()
+        self.use_tx_wave = False
+        if lirc_device:
+            self.lirc_fd = open_lirc(lirc_device)
+            return
+
+        # Forme d'onde planifiée par lgpio (tx_wave) si demandée, sinon bit-bang Python
+        if use_tx_wave and not hasattr(lgpio, 'tx_wave'):
+            raise RuntimeError("lgpio.tx_wave non disponible")
+        self.use_tx_wave = use_tx_wave
 
         self.init_gpio()
 
@@ -319,135 +256,67 @@ class OsramRGBWRemote:
             self.h = lgpio.gpiochip_open(0)
             lgpio.gpio_claim_output(self.h, self.ir_pin, 0)
         except Exception as e:
+            # Réservation refusée après l'ouverture : ne pas garder le gpiochip ouvert
+            if self.h is not None:
+                lgpio.gpiochip_close(self.h)
+                self.h = None
             raise RuntimeError(f"Erreur d'initialisation GPIO: {e}")
 
-    def nec_encode(self, address: int, command: int) -> list:
+    def nec_encode(self, address: int, command: int) -> tuple:
         """Encode une commande au format NEC"""
-        data = []
-
-        # AGC burst: 9ms ON, 4.5ms OFF
-        data.extend([9000, 4500])
-
-        # Address (8 bits, LSB first)
-        for i in range(8):
-            if (address >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # ~Address (8 bits, LSB first)
-        address_inv = (~address) & 0xFF
-        for i in range(8):
-            if (address_inv >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # Command (8 bits, LSB first)
-        for i in range(8):
-            if (command >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # ~Command (8 bits, LSB first)
-        command_inv = (~command) & 0xFF
-        for i in range(8):
-            if (command_inv >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # Stop bit
-        data.append(560)
-
-        # Compléter à 71 impulsions
-        while len(data) < 71:
-            data.append(560)
-
-        return data
-
-    def send_ir_burst(self, duration_us: int):
-        """Génère une rafale IR modulée à 38kHz"""
-        if duration_us <= 0:
-            return
-
-        period_us = 26.3  # 1000000 / 38000
-        on_time_us = period_us * self.duty_cycle
-        off_time_us = period_us - on_time_us
-
-        cycles = int(duration_us / period_us)
-
-        on_time_ns = int(on_time_us * 1000)
-        off_time_ns = int(off_time_us * 1000)
-
-        start_time = time.time_ns()
-
-        for cycle in range(cycles):
-            lgpio.gpio_write(self.h, self.ir_pin, 1)
-            target_time = start_time + (cycle * period_us * 1000) + on_time_ns
-            while time.time_ns() < target_time:
-                pass
-
-            lgpio.gpio_write(self.h, self.ir_pin, 0)
-            target_time = start_time + ((cycle + 1) * period_us * 1000)
-            while time.time_ns() < target_time:
-                pass
-
-        lgpio.gpio_write(self.h, self.ir_pin, 0)
-
-    def send_ir_signal(self, pulses: list):
-        """Envoie le signal IR avec timing précis"""
-        try:
-            try:
-                os.nice(-10)  # Priorité plus haute
-            except:
-                pass
-
-            start_time = time.time_ns()
-
-            for i, duration in enumerate(pulses):
-                if i % 2 == 0:  # Impulsion ON
-                    self.send_ir_burst(duration)
-                else:  # Pause OFF
-                    lgpio.gpio_write(self.h, self.ir_pin, 0)
-                    target_time = start_time + sum(pulses[:i+1]) * 1000
-                    while time.time_ns() < target_time:
-                        pass
-
-            lgpio.gpio_write(self.h, self.ir_pin, 0)
-
-        except Exception as e:
-            raise RuntimeError(f"Erreur lors de l'envoi IR: {e}")
+        if address == OSRAM_ADDRESS and command in _PULSE_CACHE:
+            return _PULSE_CACHE[command]
+        return _build_nec_pulses(address, command)
 
     def send_command(self, command_name: str, repeat_count: int = 0) -> bool:
-        """Envoie une commande IR OSRAM"""
-        # Conversion en majuscules et gestion des aliases
-        command_upper = command_name.upper()
-
-        if command_upper not in self.commands:
+        """
+        Envoie une commande IR OSRAM
+        command_name doit être le nom en majuscules (ex: 'ON', 'RED'), tel que
+        fourni par _COMMAND_MAPPING
+        """
+        # nice() s'applique au thread appelant : le faire dans le thread d'émission
+        if self._elevated is None:
+            self._elevated = raise_priority()
+
+        if command_name not in _PULSES_BY_NAME:
             return False
 
-        command_code = self.commands[command_upper]
-
-        # Encode et envoie
-        pulses = self.nec_encode(self.OSRAM_ADDRESS, command_code)
-        self.send_ir_signal(pulses)
-
-        # Répétitions si demandées
-        for _ in range(repeat_count):
-            time.sleep(0.108)  # Gap standard NEC
-            self.send_ir_signal(pulses)
+        # Trame précalculée suivie des codes de répétition NEC, émise d'un bloc
+        pulses = _PULSES_BY_NAME[command_name]
+        if self.lirc_fd is not None:
+            send_lirc(self.lirc_fd, encoded(_LIRC_FRAMES, pack_lirc, command_name, pulses, repeat_count))
+        elif self.use_tx_wave:
+            send_wave(self.h, self.ir_pin, encoded(_WAVES, build_wave, command_name, pulses, repeat_count))
+        else:
+            schedule = encoded(_SCHEDULES, build_schedule, command_name, pulses, repeat_count)
+            send_ir_signal(self.h, self.ir_pin, schedule)
 
         return True
 
     def cleanup(self):
         """Nettoie les ressources"""
+        if self.lirc_fd is not None:
+            os.close(self.lirc_fd)
+            self.lirc_fd = None
+
         if self.h is not None:
             lgpio.gpio_write(self.h, self.ir_pin, 0)
             lgpio.gpiochip_close(self.h)
 
 
+# Combinaisons action/commande acceptées par le modèle général
+_VALID_COMBINATION_VALUES = {
+    "power": ["on", "off", "toggle"],
+    "brightness": ["bright_up", "bright_down", "bright_max", "bright_min"],
+    "color": ["red", "green", "blue", "white", "yellow", "orange", "purple", "pink",
+              "cyan", "magenta", "warm_white", "cool_white", "lime", "navy", "teal", "maroon"],
+    "effect": ["flash", "strobe", "fade", "smooth"]
+}
+_VALID_COMBINATIONS = {action: frozenset(commands) for action, commands in _VALID_COMBINATION_VALUES.items()}
+# Liste des commandes valides formatée une fois pour les messages d'erreur
+_VALID_COMMANDS_TEXT = {action: str(commands) for action, commands in _VALID_COMBINATION_VALUES.items()}
+
+
 # Modèle Pydantic strict pour OSRAM
 class OsramGeneralParameters(BaseModel):
     """Modèle général pour le contrôle OSRAM IR"""
@@ -470,21 +339,81 @@ class OsramGeneralParameters(BaseModel):
     @model_validator(mode='after')
     def validate_action_command_compatibility(self):
         """Valide que la commande est compatible avec l'action"""
-        valid_combinations = {
-            "power": ["on", "off", "toggle"],
-            "brightness": ["bright_up", "bright_down", "bright_max", "bright_min"],
-            "color": ["red", "green", "blue", "white", "yellow", "orange", "purple", "pink",
-                     "cyan", "magenta", "warm_white", "cool_white", "lime", "navy", "teal", "maroon"],
-            "effect": ["flash", "strobe", "fade", "smooth"]
-        }
-
-        if self.command not in valid_combinations[self.action]:
-            valid_commands = valid_combinations[self.action]
-            raise ValueError(f"Commande '{self.command}' invalide pour action '{self.action}'. Commandes valides: {valid_commands}")
+        if self.command not in _VALID_COMBINATIONS[self.action]:
+            raise ValueError(f"Commande '{self.command}' invalide pour action '{self.action}'. Commandes valides: {_VALID_COMMANDS_TEXT[self.action]}")
 
         return self
 
 
+# Mapping des commandes vers format attendu par le remote
+_COMMAND_MAPPING = {
+    # Power
+    'on': 'ON',
+    'off': 'OFF',
+    'toggle': 'TOGGLE',
+    # Brightness
+    'bright_up': 'BRIGHT_UP',
+    'bright_down': 'BRIGHT_DOWN',
+    'bright_max': 'BRIGHT_MAX',
+    'bright_min': 'BRIGHT_MIN',
+    # Basic colors
+    'red': 'RED',
+    'green': 'GREEN',
+    'blue': 'BLUE',
+    'white': 'WHITE',
+    # Extended colors (résolues par _COLOR_ALIAS_REMAP)
+    'yellow': 'YELLOW',
+    'orange': 'ORANGE',
+    'purple': 'PURPLE',
+    'pink': 'PINK',
+    'cyan': 'CYAN',
+    'magenta': 'MAGENTA',
+    'warm_white': 'WHITE',
+    'cool_white': 'WHITE',
+    'lime': 'LIME',
+    'navy': 'BLUE',
+    'teal': 'BLUE1',
+    'maroon': 'RED',
+    # Effects
+    'flash': 'FLASH',
+    'strobe': 'STROBE',
+    'fade': 'FADE',
+    'smooth': 'SMOOTH'
+}
+
+
+# Validation mise en cache par combinaison de paramètres
+_validate_params = cached_validator(OsramGeneralParameters, 'action', 'command', 'repeat_count')
+
+
+# Aliases résolus vers le nom de commande validé par le modèle (ex: 'r' -> 'red')
+_ALIAS_COMMANDS = {alias: command.value for alias, command in OSRAM_ALIASES.items()}
+
+# Schéma JSON des paramètres, construit une seule fois et partagé (lecture seule)
+_PARAMETERS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {
+            "type": "string",
+            "enum": ["power", "brightness", "color", "effect"],
+            "description": "Type d'action à effectuer"
+        },
+        "command": {
+            "type": "string",
+            "description": "Commande spécifique (ex: 'on', 'red', 'bright_up', 'flash')"
+        },
+        "repeat_count": {
+            "type": "integer",
+            "minimum": 0,
+            "maximum": 10,
+            "default": 0,
+            "description": "Nombre de répétitions du signal (0-10)"
+        }
+    },
+    "required": ["action", "command"]
+}
+
+
 class IROsramAdapter(ToolAdapter):
     """Adaptateur pour le contrôle IR des ampoules OSRAM RGBW"""
 
@@ -494,49 +423,62 @@ class IROsramAdapter(ToolAdapter):
 
         # Configuration
         self.ir_pin = config.get('ir_pin', 19)
+        self.lirc_device = config.get('lirc_device')  # ex: /dev/lirc0 (overlay gpio-ir-tx)
+        self.ir_backend = ir_backend(config)  # lirc, tx_wave ou bitbang
         self.tool_name = config.get('tool_name', 'control_osram_ir')
         self.tool_description = config.get('tool_description', 'Contrôle OSRAM RGBW par infrarouge')
-        self.remote = None
+        self.remote = None  # Créé au premier execute (réservation GPIO différée)
+        self._remote_lock = asyncio.Lock()
+        # Dernier échec d'initialisation, renvoyé sans réessayer avant _remote_retry_at
+        self._remote_error = None
+        self._remote_retry_at = 0.0
+
+        # Thread unique pour les émissions IR : libère la boucle d'événements et
+        # sérialise l'accès à la broche GPIO
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ir_osram")
 
         # Mettre à jour le nom et la description depuis la config
         self.name = self.tool_name
         self.description = self.tool_description
 
-        if IS_RASPBERRY_PI and LGPIO_AVAILABLE:
-            try:
-                self.remote = OsramRGBWRemote(self.ir_pin)
-                self.logger.info(f"Adaptateur IR OSRAM initialisé (pin {self.ir_pin})")
-            except Exception as e:
-                self.logger.error(f"Erreur initialisation IR OSRAM: {e}")
-                self.remote = None
-        else:
+        # Le pilote LIRC du noyau ne dépend pas de lgpio
+        self._ir_ready = _IR_READY or self.ir_backend == 'lirc'
+        if not self._ir_ready:
             self.logger.warning(f"IR OSRAM désactivé (plateforme: {platform.machine()}, lgpio: {LGPIO_AVAILABLE})")
-            self.remote = None
+
+    async def _ensure_remote(self):
+        """
+        Ouvre le GPIO et crée la télécommande au premier usage. Après un échec,
+        l'erreur est conservée et l'ouverture n'est retentée qu'après REMOTE_RETRY_DELAY
+        """
+        if self.remote is not None or not self._ir_ready:
+            return self.remote
+        if time.monotonic() < self._remote_retry_at:
+            return None
+
+        async with self._remote_lock:
+            if self.remote is None and time.monotonic() >= self._remote_retry_at:
+                try:
+                    use_lirc = self.ir_backend == 'lirc'
+                    self.remote = OsramRGBWRemote(
+                        self.ir_pin, self.lirc_device if use_lirc else None,
+                        use_tx_wave=self.ir_backend == 'tx_wave'
+                    )
+                    self._remote_error = None
+                    target = self.lirc_device if use_lirc else f"pin {self.ir_pin}"
+                    self.logger.info(f"Adaptateur IR OSRAM initialisé ({target}, {self.ir_backend})")
+                except Exception as e:
+                    error = f"Erreur initialisation IR OSRAM: {e}"
+                    # Journalisé une fois tant que l'erreur ne change pas
+                    if error != self._remote_error:
+                        self.logger.error(error)
+                    self._remote_error = error
+                    self._remote_retry_at = time.monotonic() + REMOTE_RETRY_DELAY
+        return self.remote
 
     def get_parameters_schema(self) -> Dict[str, Any]:
         """Retourne le schéma des paramètres pour l'IR OSRAM"""
-        return {
-            "type": "object",
-            "properties": {
-                "action": {
-                    "type": "string",
-                    "enum": ["power", "brightness", "color", "effect"],
-                    "description": "Type d'action à effectuer"
-                },
-                "command": {
-                    "type": "string",
-                    "description": "Commande spécifique (ex: 'on', 'red', 'bright_up', 'flash')"
-                },
-                "repeat_count": {
-                    "type": "integer",
-                    "minimum": 0,
-                    "maximum": 10,
-                    "default": 0,
-                    "description": "Nombre de répétitions du signal (0-10)"
-                }
-            },
-            "required": ["action", "command"]
-        }
+        return _PARAMETERS_SCHEMA
 
     def get_pydantic_schema(self):
         """Retourne le modèle Pydantic pour LlamaIndex"""
@@ -544,15 +486,17 @@ class IROsramAdapter(ToolAdapter):
 
     async def execute(self, **kwargs) -> Dict[str, Any]:
         """Exécute une commande IR OSRAM avec validation stricte"""
-        if not self.remote:
+        if not await self._ensure_remote():
             return {
                 "success": False,
-                "error": "Contrôle IR OSRAM non disponible (non Raspberry Pi ou lgpio manquant)"
+                "error": self._remote_error or "Contrôle IR OSRAM non disponible (non Raspberry Pi ou lgpio manquant)"
             }
 
         try:
-            # Validation stricte avec Pydantic
-            params = OsramGeneralParameters(**kwargs)
+            # Résolution des aliases avant la validation stricte avec Pydantic
+            command = kwargs.get('command')
+            command = _ALIAS_COMMANDS.get(command, command)
+            params = _validate_params(kwargs.get('action'), command, kwargs.get('repeat_count', 0))
 
             # Exécuter selon l'action validée
             return await self._execute_validated_command(params)
@@ -566,50 +510,15 @@ class IROsramAdapter(ToolAdapter):
 
     async def _execute_validated_command(self, params: OsramGeneralParameters) -> Dict[str, Any]:
         """Exécute une commande OSRAM après validation"""
-        # Mapping des commandes vers format attendu par le remote
-        command_mapping = {
-            # Power
-            'on': 'ON',
-            'off': 'OFF',
-            'toggle': 'TOGGLE',
-            # Brightness
-            'bright_up': 'BRIGHT_UP',
-            'bright_down': 'BRIGHT_DOWN',
-            'bright_max': 'BRIGHT_MAX',
-            'bright_min': 'BRIGHT_MIN',
-            # Basic colors
-            'red': 'RED',
-            'green': 'GREEN',
-            'blue': 'BLUE',
-            'white': 'WHITE',
-            # Extended colors (aliasés vers les codes NEC)
-            'yellow': 'GREEN2',
-            'orange': 'RED1',
-            'purple': 'RED2',
-            'pink': 'RED3',
-            'cyan': 'BLUE1',
-            'magenta': 'RED4',
-            'warm_white': 'WHITE',
-            'cool_white': 'WHITE',
-            'lime': 'GREEN3',
-            'navy': 'BLUE',
-            'teal': 'BLUE1',
-            'maroon': 'RED',
-            # Effects
-            'flash': 'FLASH',
-            'strobe': 'STROBE',
-            'fade': 'FADE',
-            'smooth': 'SMOOTH'
-        }
-
-        remote_command = command_mapping.get(params.command)
-        if not remote_command:
-            return {"success": False, "error": f"Commande '{params.command}' non mappée"}
+        # Le Literal du modèle garantit que la commande est mappée
+        remote_command = _COMMAND_MAPPING[params.command]
 
         self.logger.info(f"Envoi commande IR OSRAM: {params.action}/{params.command} -> {remote_command}")
 
         # Envoi de la commande avec répétitions
-        success = self.remote.send_command(remote_command, params.repeat_count)
+        success = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.remote.send_command, remote_command, params.repeat_count
+        )
         if not success:
             return {"success": False, "error": f"Échec envoi commande '{params.command}'"}
 
@@ -628,6 +537,8 @@ class IROsramAdapter(ToolAdapter):
 
     async def cleanup(self) -> None:
         """Nettoie les ressources"""
-        if self.remote:
+        self._executor.shutdown(wait=True)
+        if self.remote is not None:
             self.remote.cleanup()
+            self.remote = None
         self.logger.info("Adaptateur IR OSRAM nettoyé")
\ No newline at end of file
@@ -7,15 +7,25 @@ import asyncio
 import os
 import platform
 import time
-from typing import Dict, Any, Union, Optional, Annotated, Literal
+import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from typing import Dict, Any, Literal
 import logging
-from pydantic import BaseModel, Field, model_validator, Discriminator
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
 
 from ...core.interfaces import ToolAdapter
+from ..ir_common import (
+    build_schedule, build_wave, cached_validator, encoded, ir_backend, open_lirc, pack_lirc,
+    raise_priority, send_ir_signal, send_lirc, send_wave, CARRIER_FREQ, DUTY_CYCLE,
+    NEC_BIT0, NEC_BIT1
+)
 
-# Vérification de la plateforme
-IS_RASPBERRY_PI = platform.machine().startswith('arm') or platform.machine().startswith('aarch64')
+# Vérification de la plateforme (architecture lue une seule fois)
+_MACHINE = platform.machine()
+IS_RASPBERRY_PI = _MACHINE.startswith(('arm', 'aarch64'))
 
 # Import conditionnel du code IR Yamaha
 if IS_RASPBERRY_PI:
@@ -27,6 +37,8 @@ if IS_RASPBERRY_PI:
 else:
     LGPIO_AVAILABLE = False
 
+# Disponibilité de l'émission IR, évaluée une seule fois à l'import
+_IR_READY = IS_RASPBERRY_PI and LGPIO_AVAILABLE
 
 class YamahaCommand(str, Enum):
     """Commandes IR Yamaha disponibles"""
@@ -87,30 +99,30 @@ class YamahaAction(str, Enum):
     FUNCTION = "function"
 
 
-# Mappage des commandes par catégorie d'action
+# Mappage des commandes par catégorie d'action (ensembles figés, appartenance en O(1))
 COMMAND_ACTIONS = {
-    YamahaAction.POWER: [YamahaCommand.POWER],
-    YamahaAction.VOLUME: [YamahaCommand.VOL_UP, YamahaCommand.VOL_DOWN],
-    YamahaAction.PLAYBACK: [
+    YamahaAction.POWER: frozenset({YamahaCommand.POWER}),
+    YamahaAction.VOLUME: frozenset({YamahaCommand.VOL_UP, YamahaCommand.VOL_DOWN}),
+    YamahaAction.PLAYBACK: frozenset({
         YamahaCommand.PLAY, YamahaCommand.PAUSE, YamahaCommand.STOP,
         YamahaCommand.FF, YamahaCommand.REW
-    ],
-    YamahaAction.SOURCE: [
+    }),
+    YamahaAction.SOURCE: frozenset({
         YamahaCommand.TUNER, YamahaCommand.TAPE, YamahaCommand.AUX,
         YamahaCommand.MD, YamahaCommand.DVD, YamahaCommand.MODE
-    ],
-    YamahaAction.PRESET: [YamahaCommand.PRESET_UP, YamahaCommand.PRESET_DOWN],
-    YamahaAction.DIGIT: [
+    }),
+    YamahaAction.PRESET: frozenset({YamahaCommand.PRESET_UP, YamahaCommand.PRESET_DOWN}),
+    YamahaAction.DIGIT: frozenset({
         YamahaCommand.DIGIT_0, YamahaCommand.DIGIT_1, YamahaCommand.DIGIT_2,
         YamahaCommand.DIGIT_3, YamahaCommand.DIGIT_4, YamahaCommand.DIGIT_5,
         YamahaCommand.DIGIT_6, YamahaCommand.DIGIT_7, YamahaCommand.DIGIT_8,
         YamahaCommand.DIGIT_9
-    ],
-    YamahaAction.FUNCTION: [
+    }),
+    YamahaAction.FUNCTION: frozenset({
         YamahaCommand.RANDOM, YamahaCommand.REPEAT, YamahaCommand.DISPLAY,
         YamahaCommand.SLEEP, YamahaCommand.MODE_10, YamahaCommand.START_100,
         YamahaCommand.TIME
-    ]
+    })
 }
 
 # Mappage des aliases pour rétrocompatibilité
@@ -138,100 +150,18 @@ YAMAHA_ALIASES = {
 }
 
 
-# Modèles Pydantic stricts par action avec validation
-class YamahaBaseParameters(BaseModel):
-    """Paramètres de base pour toutes les actions Yamaha IR"""
-    pass
-
-class YamahaPowerParameters(YamahaBaseParameters):
-    """Paramètres pour le contrôle d'alimentation Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.POWER, description="Action d'alimentation")
-    command: YamahaCommand = Field(description="Commande: power")
-    double_send: bool = Field(default=True, description="Envoi double pour fiabilité")
-
-    @model_validator(mode='after')
-    def validate_power_command(self):
-        """Valide que la commande correspond à l'action power"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.POWER]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.POWER]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'power'. Commandes valides: {valid_commands}")
-        return self
-
-class YamahaVolumeParameters(YamahaBaseParameters):
-    """Paramètres pour le contrôle de volume Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.VOLUME, description="Action de volume")
-    command: YamahaCommand = Field(description="Commande: vol_up ou vol_down")
-    repeat_count: int = Field(default=1, ge=1, le=10, description="Répétitions (1-10)")
-
-    @model_validator(mode='after')
-    def validate_volume_command(self):
-        """Valide que la commande correspond à l'action volume"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.VOLUME]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.VOLUME]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'volume'. Commandes valides: {valid_commands}")
-        return self
-
-class YamahaPlaybackParameters(YamahaBaseParameters):
-    """Paramètres pour le contrôle de lecture Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.PLAYBACK, description="Action de lecture")
-    command: YamahaCommand = Field(description="Commande: play, pause, stop, ff, rew")
-
-    @model_validator(mode='after')
-    def validate_playback_command(self):
-        """Valide que la commande correspond à l'action playback"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.PLAYBACK]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.PLAYBACK]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'playback'. Commandes valides: {valid_commands}")
-        return self
-
-class YamahaSourceParameters(YamahaBaseParameters):
-    """Paramètres pour la sélection de source Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.SOURCE, description="Action de source")
-    command: YamahaCommand = Field(description="Commande: tuner, tape, aux, md, dvd, mode")
-
-    @model_validator(mode='after')
-    def validate_source_command(self):
-        """Valide que la commande correspond à l'action source"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.SOURCE]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.SOURCE]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'source'. Commandes valides: {valid_commands}")
-        return self
-
-class YamahaDigitParameters(YamahaBaseParameters):
-    """Paramètres pour la saisie de chiffres Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.DIGIT, description="Action de chiffre")
-    command: YamahaCommand = Field(description="Commande: digit_0 à digit_9")
-
-    @model_validator(mode='after')
-    def validate_digit_command(self):
-        """Valide que la commande correspond à l'action digit"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.DIGIT]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.DIGIT]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'digit'. Commandes valides: {valid_commands}")
-        return self
-
-class YamahaFunctionParameters(YamahaBaseParameters):
-    """Paramètres pour les fonctions Yamaha"""
-    action: YamahaAction = Field(default=YamahaAction.FUNCTION, description="Action de fonction")
-    command: YamahaCommand = Field(description="Commande: random, repeat, display, sleep, etc.")
-
-    @model_validator(mode='after')
-    def validate_function_command(self):
-        """Valide que la commande correspond à l'action function"""
-        if self.command not in COMMAND_ACTIONS[YamahaAction.FUNCTION]:
-            valid_commands = [cmd.value for cmd in COMMAND_ACTIONS[YamahaAction.FUNCTION]]
-            raise ValueError(f"Commande '{self.command}' invalide pour action 'function'. Commandes valides: {valid_commands}")
-        return self
-
-# Union des paramètres Yamaha (sans discriminator pour simplifier)
-YamahaParameters = Union[
-    YamahaPowerParameters,
-    YamahaVolumeParameters,
-    YamahaPlaybackParameters,
-    YamahaSourceParameters,
-    YamahaDigitParameters,
-    YamahaFunctionParameters
-]
+# Combinaisons action/commande acceptées par le modèle général
+_VALID_COMBINATION_VALUES = {
+    "power": ["power"],
+    "volume": ["vol_up", "vol_down"],
+    "playback": ["play", "pause", "stop", "ff", "rew"],
+    "source": ["tuner", "tape", "aux", "md", "dvd", "mode"],
+    "digit": ["digit_0", "digit_1", "digit_2", "digit_3", "digit_4",
+              "digit_5", "digit_6", "digit_7", "digit_8", "digit_9"],
+    "function": ["random", "repeat", "display", "sleep", "mode_10",
+                 "start_100", "preset_up", "preset_down", "time"]
+}
+_VALID_COMBINATIONS = {action: frozenset(commands) for action, commands in _VALID_COMBINATION_VALUES.items()}
 
 
 # Modèle général pour LlamaIndex avec littéraux stricts
@@ -261,84 +191,166 @@ class YamahaGeneralParameters(BaseModel):
     @model_validator(mode='after')
     def validate_action_command_compatibility(self):
         """Valide que la commande est compatible avec l'action"""
-        # Mapping action -> commandes valides
-        valid_combinations = {
-            "power": ["power"],
-            "volume": ["vol_up", "vol_down"],
-            "playback": ["play", "pause", "stop", "ff", "rew"],
-            "source": ["tuner", "tape", "aux", "md", "dvd", "mode"],
-            "digit": ["digit_0", "digit_1", "digit_2", "digit_3", "digit_4",
-                     "digit_5", "digit_6", "digit_7", "digit_8", "digit_9"],
-            "function": ["random", "repeat", "display", "sleep", "mode_10",
-                        "start_100", "preset_up", "preset_down", "time"]
-        }
-
-        if self.command not in valid_combinations[self.action]:
-            valid_commands = valid_combinations[self.action]
+        if self.command not in _VALID_COMBINATIONS[self.action]:
+            valid_commands = _VALID_COMBINATION_VALUES[self.action]
             raise ValueError(f"Commande '{self.command}' invalide pour action '{self.action}'. Commandes valides: {valid_commands}")
 
         return self
 
 
+# Adresse NEC des amplificateurs Yamaha
+YAMAHA_ADDRESS = 0x78
+
+# Codes de commandes Yamaha (du script original), en lecture seule
+YAMAHA_COMMANDS = types.MappingProxyType({
+    'POWER': 0x0F,
+    'DIGIT_0': 0x10,
+    'DIGIT_1': 0x11,
+    'DIGIT_2': 0x12,
+    'DIGIT_3': 0x13,
+    'DIGIT_4': 0x14,
+    'DIGIT_5': 0x15,
+    'DIGIT_6': 0x16,
+    'DIGIT_7': 0x17,
+    'DIGIT_8': 0x18,
+    'DIGIT_9': 0x19,
+    'MODE_10': 0x1A,
+    'START_100': 0x1D,
+    'REP_A': 0x0C,
+    'RANDOM_B': 0x07,
+    'PROG_C': 0x0B,
+    'D_KEY': 0x09,
+    'PAUSE': 0x0A,
+    'TIME': 0x08,
+    'PLAY': 0x02,
+    'REW': 0x04,
+    'STOP': 0x01,
+    'FF': 0x03,
+    'TAPE_DIR': 0x43,
+    'PRESET_DN': 0x1C,
+    'TUNER': 0x4B,
+    'PRESET_UP': 0x1B,
+    'MD': 0x57,
+    'DVD': 0x4A,
+    'TAPE': 0x41,
+    'AUX': 0x49,
+    'MD_REC': 0x58,
+    'TAPE_REC': 0x46,
+    'MODE': 0x05,
+    'START': 0x06,
+    'SLEEP': 0x4F,
+    'VOL_UP': 0x1E,
+    'DISPLAY': 0x4E,
+    'VOL_DOWN': 0x1F
+})
+
+
+def _encode_byte(value: int) -> tuple:
+    """Impulsions des 8 bits d'un octet (LSB first)"""
+    return tuple(chain.from_iterable(NEC_BIT1 if (value >> i) & 1 else NEC_BIT0 for i in range(8)))
+
+
+# Table octet -> 16 impulsions, calculée une fois pour les 256 valeurs
+_BYTE_PULSES = tuple(_encode_byte(value) for value in range(256))
+
+
+def _build_nec_pulses(address: int, command: int) -> tuple:
+    """Construit la trame NEC complète d'une commande"""
+    return (
+        (9000, 4500)  # AGC burst: 9ms ON, 4.5ms OFF
+        + _BYTE_PULSES[address]
+        + _BYTE_PULSES[(~address) & 0xFF]
+        + _BYTE_PULSES[command]
+        + _BYTE_PULSES[(~command) & 0xFF]
+        + (560,)  # Stop bit
+    )
+
+
+# Trames NEC par code (adresse Yamaha fixe), construites au premier envoi de
+# chaque code : rien à calculer si l'IR est désactivé
+_PULSE_CACHE = {}
+
+
+def _nec_pulses(command: int) -> tuple:
+    """Trame NEC d'un code de commande Yamaha, mise en cache"""
+    pulses = _PULSE_CACHE.get(command)
+    if pulses is None:
+        pulses = _PULSE_CACHE[command] = _build_nec_pulses(YAMAHA_ADDRESS, command)
+    return pulses
+
+
+# Noms de la télécommande qui diffèrent de la commande en majuscules
+_REMOTE_NAME_OVERRIDES = {
+    'random': 'RANDOM_B',
+    'repeat': 'REP_A',
+    'preset_down': 'PRESET_DN'
+}
+
+# Commandes acceptées par le modèle mais non mappées vers la télécommande
+_UNMAPPED_COMMANDS = frozenset({'mode_10', 'start_100', 'time'})
+
+# Mapping des commandes vers format attendu par le remote
+_COMMAND_MAPPING = {
+    command.value: _REMOTE_NAME_OVERRIDES.get(command.value, command.value.upper())
+    for command in YamahaCommand
+    if command.value not in _UNMAPPED_COMMANDS
+}
+
+
+# Validation mise en cache par combinaison de paramètres
+_validate_params = cached_validator(
+    YamahaGeneralParameters, 'action', 'command', 'double_send', 'repeat_count'
+)
+
+
+# Séquences encodées par mode d'émission, construites au premier envoi et
+# partagées par toutes les instances : (code, répétitions) -> séquence
+_WAVES = {}
+_SCHEDULES = {}
+_LIRC_FRAMES = {}
+
+
 class YamahaRemote:
     """
     Classe pour contrôler les amplificateurs Yamaha par IR
     Adaptée du script original pour intégration dans GLaDOS
     """
 
-    def __init__(self, ir_pin: int = 18):
+    # Attributs fixes : pas de __dict__ par instance, accès direct dans les boucles d'émission
+    __slots__ = ('ir_pin', 'h', 'lirc_fd', 'YAMAHA_ADDRESS', 'carrier_freq', 'duty_cycle',
+                 'use_tx_wave', '_elevated')
+
+    # Codes de commandes Yamaha, partagés par toutes les instances
+    commands = YAMAHA_COMMANDS
+
+    # gpiochip ouvert une seule fois par processus, partagé entre instances
+    _chip_handle = None
+    _chip_refs = 0
+
+    def __init__(self, ir_pin: int = 18, lirc_device: str = None, use_tx_wave: bool = False):
         self.ir_pin = ir_pin
         self.h = None
-        self.YAMAHA_ADDRESS = 0x78
-
-        # Codes de commandes Yamaha (du script original)
-        self.commands = {
-            'POWER': 0x0F,
-            'DIGIT_0': 0x10,
-            'DIGIT_1': 0x11,
-            'DIGIT_2': 0x12,
-            'DIGIT_3': 0x13,
-            'DIGIT_4': 0x14,
-            'DIGIT_5': 0x15,
-            'DIGIT_6': 0x16,
-            'DIGIT_7': 0x17,
-            'DIGIT_8': 0x18,
-            'DIGIT_9': 0x19,
-            'MODE_10': 0x1A,
-            'START_100': 0x1D,
-            'REP_A': 0x0C,
-            'RANDOM_B': 0x07,
-            'PROG_C': 0x0B,
-            'D_KEY': 0x09,
-            'PAUSE': 0x0A,
-            'TIME': 0x08,
-            'PLAY': 0x02,
-            'REW': 0x04,
-            'STOP': 0x01,
-            'FF': 0x03,
-            'TAPE_DIR': 0x43,
-            'PRESET_DN': 0x1C,
-            'TUNER': 0x4B,
-            'PRESET_UP': 0x1B,
-            'MD': 0x57,
-            'DVD': 0x4A,
-            'TAPE': 0x41,
-            'AUX': 0x49,
-            'MD_REC': 0x58,
-            'TAPE_REC': 0x46,
-            'MODE': 0x05,
-            'START': 0x06,
-            'SLEEP': 0x4F,
-            'VOL_UP': 0x1E,
-            'DISPLAY': 0x4E,
-            'VOL_DOWN': 0x1F
-        }
+        self.lirc_fd = None
+        self.YAMAHA_ADDRESS = YAMAHA_ADDRESS
 
         # Optimisations timing
-        self.carrier_freq = 38000
-        self.duty_cycle = 0.33
-
-        self.init_gpio()
+        self.carrier_freq = CARRIER_FREQ
+        self.duty_cycle = DUTY_CYCLE
+
+        # Priorité du thread d'émission, élevée une seule fois au premier envoi
+        self._elevated = None
+
+        # Pilote noyau pwm-ir-tx (porteuse 38kHz par le PWM matériel, GPIO 18 par
+        # défaut) ou gpio-ir-tx : une trame complète par write(), sans lgpio.
+        # Sinon forme d'onde planifiée par lgpio (tx_wave) si demandée, ou bit-bang Python
+        self.use_tx_wave = False
+        if lirc_device:
+            self.lirc_fd = open_lirc(lirc_device)
+        else:
+            if use_tx_wave and not hasattr(lgpio, 'tx_wave'):
+                raise RuntimeError("lgpio.tx_wave non disponible")
+            self.use_tx_wave = use_tx_wave
+            self.init_gpio()
 
     def init_gpio(self):
         """Initialise la connexion GPIO avec lgpio"""
@@ -346,132 +358,94 @@ class YamahaRemote:
             raise RuntimeError("lgpio non disponible")
 
         try:
-            self.h = lgpio.gpiochip_open(0)
-            lgpio.gpio_claim_output(self.h, self.ir_pin, 0)
+            if YamahaRemote._chip_handle is None:
+                YamahaRemote._chip_handle = lgpio.gpiochip_open(0)
+            lgpio.gpio_claim_output(YamahaRemote._chip_handle, self.ir_pin, 0)
         except Exception as e:
+            self._release_chip()
             raise RuntimeError(f"Erreur d'initialisation GPIO: {e}")
 
-    def nec_encode(self, address: int, command: int) -> list:
-        """Encode une commande au format NEC"""
-        data = []
-
-        # AGC burst: 9ms ON, 4.5ms OFF
-        data.extend([9000, 4500])
-
-        # Address (8 bits, LSB first)
-        for i in range(8):
-            if (address >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # ~Address (8 bits, LSB first)
-        address_inv = (~address) & 0xFF
-        for i in range(8):
-            if (address_inv >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # Command (8 bits, LSB first)
-        for i in range(8):
-            if (command >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # ~Command (8 bits, LSB first)
-        command_inv = (~command) & 0xFF
-        for i in range(8):
-            if (command_inv >> i) & 1:
-                data.extend([560, 1690])  # Bit 1
-            else:
-                data.extend([560, 560])   # Bit 0
-
-        # Stop bit
-        data.append(560)
-
-        return data
-
-    def send_ir_burst(self, duration_us: int):
-        """Génère une rafale IR modulée à 38kHz"""
-        if duration_us <= 0:
-            return
-
-        period_us = 26.3  # 1000000 / 38000
-        on_time_us = period_us * self.duty_cycle
-        off_time_us = period_us - on_time_us
-
-        cycles = int(duration_us / period_us)
-
-        on_time_ns = int(on_time_us * 1000)
-        off_time_ns = int(off_time_us * 1000)
-
-        start_time = time.time_ns()
+        self.h = YamahaRemote._chip_handle
+        YamahaRemote._chip_refs += 1
 
-        for cycle in range(cycles):
-            lgpio.gpio_write(self.h, self.ir_pin, 1)
-            target_time = start_time + (cycle * period_us * 1000) + on_time_ns
-            while time.time_ns() < target_time:
-                pass
+    @staticmethod
+    def _release_chip():
+        """Ferme le gpiochip partagé quand plus aucune instance ne l'utilise"""
+        if YamahaRemote._chip_refs == 0 and YamahaRemote._chip_handle is not None:
+            lgpio.gpiochip_close(YamahaRemote._chip_handle)
+            YamahaRemote._chip_handle = None
 
-            lgpio.gpio_write(self.h, self.ir_pin, 0)
-            target_time = start_time + ((cycle + 1) * period_us * 1000)
-            while time.time_ns() < target_time:
-                pass
-
-        lgpio.gpio_write(self.h, self.ir_pin, 0)
-
-    def send_ir_signal(self, pulses: list):
-        """Envoie le signal IR avec timing précis"""
-        try:
-            try:
-                os.nice(-10)  # Priorité plus haute
-            except:
-                pass
-
-            start_time = time.time_ns()
-
-            for i, duration in enumerate(pulses):
-                if i % 2 == 0:  # Impulsion ON
-                    self.send_ir_burst(duration)
-                else:  # Pause OFF
-                    lgpio.gpio_write(self.h, self.ir_pin, 0)
-                    target_time = start_time + sum(pulses[:i+1]) * 1000
-                    while time.time_ns() < target_time:
-                        pass
-
-            lgpio.gpio_write(self.h, self.ir_pin, 0)
+    def nec_encode(self, address: int, command: int) -> tuple:
+        """Encode une commande au format NEC"""
+        if address == YAMAHA_ADDRESS:
+            return _nec_pulses(command)
+        return _build_nec_pulses(address, command)
+
+    def prepare_command(self, command_name: str, repeat_count: int = 0):
+        """
+        Trame d'une commande suivie de repeat_count codes de répétition NEC,
+        encodée au premier usage puis réutilisée, prête à émettre avec send_prepared :
+        écritures LIRC (découpées sous la limite du noyau), forme d'onde lgpio,
+        ou échéancier pour le bit-bang Python.
+        None si la commande est inconnue
+        command_name doit être le nom en majuscules (ex: 'POWER', 'VOL_UP'), tel que
+        fourni par _COMMAND_MAPPING
+        """
+        command_code = self.commands.get(command_name)
+        if command_code is None:
+            return None
+
+        pulses = _nec_pulses(command_code)
+        if self.lirc_fd is not None:
+            return encoded(_LIRC_FRAMES, pack_lirc, command_code, pulses, repeat_count)
+        if self.use_tx_wave:
+            return encoded(_WAVES, build_wave, command_code, pulses, repeat_count)
+        return encoded(_SCHEDULES, build_schedule, command_code, pulses, repeat_count)
+
+    def send_prepared(self, frame, double_send: bool = False):
+        """Émet une trame obtenue par prepare_command"""
+        # nice() s'applique au thread appelant : le faire dans le thread d'émission
+        if self._elevated is None:
+            self._elevated = raise_priority()
+
+        # Un seul write() LIRC ou une seule soumission tx_wave, sinon bit-bang Python
+        if self.lirc_fd is not None:
+            send = partial(send_lirc, self.lirc_fd)
+        elif self.use_tx_wave:
+            send = partial(send_wave, self.h, self.ir_pin)
+        else:
+            send = partial(send_ir_signal, self.h, self.ir_pin)
+        send(frame)
 
-        except Exception as e:
-            raise RuntimeError(f"Erreur lors de l'envoi IR: {e}")
+        # Double envoi si demandé
+        if double_send:
+            time.sleep(0.108)  # Gap standard NEC
+            send(frame)
 
     def send_command(self, command_name: str, double_send: bool = False) -> bool:
         """Envoie une commande IR Yamaha"""
-        # Conversion en majuscules
-        command_upper = command_name.upper()
-
-        if command_upper not in self.commands:
+        frame = self.prepare_command(command_name)
+        if frame is None:
             return False
 
-        command_code = self.commands[command_upper]
-
-        # Encode et envoie
-        pulses = self.nec_encode(self.YAMAHA_ADDRESS, command_code)
-        self.send_ir_signal(pulses)
-
-        # Double envoi si demandé
-        if double_send:
-            time.sleep(0.108)  # Gap standard NEC
-            self.send_ir_signal(pulses)
-
+        self.send_prepared(frame, double_send)
         return True
 
     def cleanup(self):
         """Nettoie les ressources"""
-        if self.h is not None:
-            lgpio.gpio_write(self.h, self.ir_pin, 0)
-            lgpio.gpiochip_close(self.h)
+        if self.lirc_fd is not None:
+            os.close(self.lirc_fd)
+            self.lirc_fd = None
+
+        if self.h is None:
+            return
+
+        lgpio.gpio_write(self.h, self.ir_pin, 0)
+        lgpio.gpio_free(self.h, self.ir_pin)
+        self.h = None
+
+        YamahaRemote._chip_refs -= 1
+        self._release_chip()
 
 
 class IRYamahaAdapter(ToolAdapter):
@@ -483,23 +457,35 @@ class IRYamahaAdapter(ToolAdapter):
 
         # Configuration
         self.ir_pin = config.get('ir_pin', 18)
+        self.lirc_device = config.get('lirc_device')  # ex: /dev/lirc0 (overlay pwm-ir-tx)
+        self.ir_backend = ir_backend(config)  # lirc, tx_wave ou bitbang
         self.tool_name = config.get('tool_name', 'control_yamaha_ir')
         self.tool_description = config.get('tool_description', 'Contrôle Yamaha par infrarouge')
         self.remote = None
 
+        # Thread unique pour les émissions IR : libère la boucle d'événements et
+        # sérialise l'accès à la broche GPIO
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ir_yamaha")
+
         # Mettre à jour le nom et la description depuis la config
         self.name = self.tool_name
         self.description = self.tool_description
 
-        if IS_RASPBERRY_PI and LGPIO_AVAILABLE:
+        # Le pilote LIRC du noyau ne dépend pas de lgpio
+        use_lirc = self.ir_backend == 'lirc'
+        if _IR_READY or use_lirc:
             try:
-                self.remote = YamahaRemote(self.ir_pin)
-                self.logger.info(f"Adaptateur IR Yamaha initialisé (pin {self.ir_pin})")
+                self.remote = YamahaRemote(
+                    self.ir_pin, self.lirc_device if use_lirc else None,
+                    use_tx_wave=self.ir_backend == 'tx_wave'
+                )
+                target = self.lirc_device if use_lirc else f"pin {self.ir_pin}"
+                self.logger.info(f"Adaptateur IR Yamaha initialisé ({target}, {self.ir_backend})")
             except Exception as e:
                 self.logger.error(f"Erreur initialisation IR Yamaha: {e}")
                 self.remote = None
         else:
-            self.logger.warning(f"IR Yamaha désactivé (plateforme: {platform.machine()}, lgpio: {LGPIO_AVAILABLE})")
+            self.logger.warning(f"IR Yamaha désactivé (plateforme: {_MACHINE}, lgpio: {LGPIO_AVAILABLE})")
             self.remote = None
 
     def get_parameters_schema(self) -> Dict[str, Any]:
@@ -546,7 +532,10 @@ class IRYamahaAdapter(ToolAdapter):
 
         try:
             # Validation stricte avec Pydantic
-            params = YamahaGeneralParameters(**kwargs)
+            params = _validate_params(
+                kwargs.get('action'), kwargs.get('command'),
+                kwargs.get('double_send', True), kwargs.get('repeat_count', 1)
+            )
 
             # Exécuter selon l'action validée
             return await self._execute_validated_command(params)
@@ -560,41 +549,7 @@ class IRYamahaAdapter(ToolAdapter):
 
     async def _execute_validated_command(self, params: YamahaGeneralParameters) -> Dict[str, Any]:
         """Exécute une commande Yamaha après validation"""
-        # Mapping des commandes vers format attendu par le remote
-        command_mapping = {
-            'power': 'POWER',
-            'vol_up': 'VOL_UP',
-            'vol_down': 'VOL_DOWN',
-            'play': 'PLAY',
-            'pause': 'PAUSE',
-            'stop': 'STOP',
-            'ff': 'FF',
-            'rew': 'REW',
-            'tuner': 'TUNER',
-            'tape': 'TAPE',
-            'aux': 'AUX',
-            'md': 'MD',
-            'dvd': 'DVD',
-            'mode': 'MODE',
-            'digit_0': 'DIGIT_0',
-            'digit_1': 'DIGIT_1',
-            'digit_2': 'DIGIT_2',
-            'digit_3': 'DIGIT_3',
-            'digit_4': 'DIGIT_4',
-            'digit_5': 'DIGIT_5',
-            'digit_6': 'DIGIT_6',
-            'digit_7': 'DIGIT_7',
-            'digit_8': 'DIGIT_8',
-            'digit_9': 'DIGIT_9',
-            'random': 'RANDOM_B',
-            'repeat': 'REP_A',
-            'display': 'DISPLAY',
-            'sleep': 'SLEEP',
-            'preset_up': 'PRESET_UP',
-            'preset_down': 'PRESET_DN'
-        }
-
-        remote_command = command_mapping.get(params.command)
+        remote_command = _COMMAND_MAPPING.get(params.command)
         if not remote_command:
             return {"success": False, "error": f"Commande '{params.command}' non mappée"}
 
@@ -604,14 +559,14 @@ class IRYamahaAdapter(ToolAdapter):
 
         self.logger.info(f"Envoi commande IR Yamaha: {params.action}/{params.command} -> {remote_command}")
 
-        # Envoi avec répétitions si nécessaire
-        for i in range(use_repeat_count):
-            success = self.remote.send_command(remote_command, use_double_send)
-            if not success:
-                return {"success": False, "error": f"Échec envoi commande '{params.command}'"}
+        # Trame suivie des codes de répétition NEC, émise d'un bloc
+        frame = self.remote.prepare_command(remote_command, use_repeat_count - 1)
+        if frame is None:
+            return {"success": False, "error": f"Échec envoi commande '{params.command}'"}
 
-            if i < use_repeat_count - 1:
-                time.sleep(0.5)
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.remote.send_prepared, frame, use_double_send
+        )
 
         # Construire le message de résultat
         message = f"Commande {params.action}/{params.command} envoyée"
@@ -632,6 +587,7 @@ class IRYamahaAdapter(ToolAdapter):
 
     async def cleanup(self) -> None:
         """Nettoie les ressources"""
+        self._executor.shutdown(wait=True)
         if self.remote:
             self.remote.cleanup()
         self.logger.info("Adaptateur IR Yamaha nettoyé")
\ No newline at end of file
@@ -4,6 +4,7 @@ Basé sur les scripts existants dans MarkIO/Scripts/BT_TAPO
 """
 
 import asyncio
+import time
 from typing import Dict, Any, List, Optional, Union
 from tapo import ApiClient
 import logging
@@ -11,7 +12,7 @@ from pydantic import BaseModel, Field, model_validator, Discriminator
 from enum import Enum
 
 from ...core.interfaces import ToolAdapter
-from ...config.config_manager import ConfigManager
+from ...config.config_manager import config_manager
 
 
 class TapoDeviceType(str, Enum):
@@ -40,6 +41,17 @@ DEVICE_ACTIONS = {
 # Mappage dynamique des appareils vers leur type (rempli depuis la config)
 DEVICE_TYPE_MAPPING: Dict[str, TapoDeviceType] = {}
 
+# Durée de réutilisation d'une connexion appareil (s) avant un nouveau login,
+# pour suivre les redémarrages et changements de session des appareils
+DEVICE_HANDLE_TTL = 600
+
+# Durée de validité des informations lues sur un appareil (s) pour toggle/get_info
+DEVICE_INFO_TTL = 2
+
+# Durée de confiance du dernier état allumé/éteint connu (s) : au-delà, toggle
+# relit l'appareil (état modifié par l'application ou l'interrupteur)
+LAST_STATE_TTL = 30
+
 
 # Dictionnaire des couleurs supportées (noms anglais → RGB)
 TAPO_COLORS = {
@@ -236,14 +248,26 @@ class TapoAdapter(ToolAdapter):
         self.logger = logging.getLogger(__name__)
         
         # Configuration Tapo
-        self.email = config.get('email') or ConfigManager().get_env_var('TAPO_EMAIL')
-        self.password = config.get('password') or ConfigManager().get_env_var('TAPO_PASSWORD')
+        self.email = config.get('email') or config_manager.get_env_var('TAPO_EMAIL')
+        self.password = config.get('password') or config_manager.get_env_var('TAPO_PASSWORD')
         self.devices = config.get('devices', {})
         self.tool_name = config.get('tool_name', 'control_tapo_device')
         self.tool_description = config.get('tool_description', 'Contrôle des appareils Tapo connectés')
         
         # Client API
         self.client = None
+
+        # Connexions aux appareils réutilisées entre les appels :
+        # (type, ip) -> (appareil, horodatage du login)
+        self._device_cache: Dict[tuple, tuple] = {}
+        self._device_locks: Dict[tuple, asyncio.Lock] = {}
+
+        # Dernières informations lues par appareil : nom -> (horodatage, info)
+        self._info_cache: Dict[str, tuple] = {}
+
+        # Dernier état allumé/éteint connu par appareil (horodatage, état),
+        # pour basculer sans relecture
+        self._last_state: Dict[str, tuple] = {}
         
         if not self.email or not self.password:
             raise ValueError("Email et mot de passe Tapo requis")
@@ -257,6 +281,9 @@ class TapoAdapter(ToolAdapter):
         # Construire la description dynamiquement avec la liste des appareils
         self._build_description()
 
+        # Schéma construit une seule fois : la liste des appareils ne change plus
+        self._schema_cache = self._build_schema()
+
     def _update_device_type_mapping(self) -> None:
         """Met à jour le mappage global des types d'appareils selon la config"""
         global DEVICE_TYPE_MAPPING
@@ -361,21 +388,19 @@ class TapoAdapter(ToolAdapter):
                 self.logger.info(f"Password length: {len(self.password)} chars")
                 self.client = ApiClient(self.email, self.password)
 
-            self.logger.info(f"Connexion à {device_name} ({device_type}) sur {device_ip}")
-
-            # Connecter à l'appareil selon le type
-            if device_type.upper() == 'P110':
-                device = await self.client.p110(device_ip)
-            elif device_type.upper() == 'L530':
-                device = await self.client.l530(device_ip)
-            else:
+            # Connexion à l'appareil, réutilisée si déjà ouverte
+            device = await self._get_device(device_type, device_ip)
+            if device is None:
                 return {
                     "success": False,
                     "error": f"Type d'appareil non supporté: {device_type}"
                 }
             
             # Passer les paramètres validés à _execute_action
-            result = await self._execute_action(device, action, device_type, params)
+            result = await self._execute_action(device, device_name, action, device_type, params)
+            if action != 'get_info':
+                # État modifié (ou incertain après un échec) : relire au prochain besoin
+                self._info_cache.pop(device_name, None)
             result["device_name"] = device_display_name
             result["device_type"] = device_type
             
@@ -389,34 +414,123 @@ class TapoAdapter(ToolAdapter):
                 "error": str(e)
             }
     
-    async def _execute_action(self, device, action: str, device_type: str, params: TapoUnifiedParameters) -> Dict[str, Any]:
+    async def execute_many(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Exécute plusieurs actions en parallèle (une par appareil de préférence)
+        Les résultats sont renvoyés dans l'ordre des opérations
+        """
+        if not operations:
+            return []
+
+        results = await asyncio.gather(
+            *(self.execute(**operation) for operation in operations),
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "error": str(result)} if isinstance(result, BaseException) else result
+            for result in results
+        ]
+
+    async def all_off(self) -> List[Dict[str, Any]]:
+        """Éteint tous les appareils configurés en parallèle"""
+        return await self.execute_many([
+            {"device_name": device_name, "action": "off"} for device_name in self.devices
+        ])
+
+    async def _get_device(self, device_type: str, device_ip: str):
+        """
+        Retourne la connexion à un appareil, ouverte au premier appel puis réutilisée
+        pendant DEVICE_HANDLE_TTL secondes. None si le type n'est pas supporté
+        """
+        key = (device_type.upper(), device_ip)
+        cached = self._device_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < DEVICE_HANDLE_TTL:
+            return cached[0]
+
+        # Un seul login par appareil même si plusieurs appels arrivent en même temps
+        lock = self._device_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._device_cache.get(key)
+            if cached is not None and time.monotonic() - cached[1] < DEVICE_HANDLE_TTL:
+                return cached[0]
+
+            self.logger.info(f"Connexion à {device_ip} ({device_type})")
+
+            # Connecter à l'appareil selon le type
+            if key[0] == 'P110':
+                device = await self.client.p110(device_ip)
+            elif key[0] == 'L530':
+                device = await self.client.l530(device_ip)
+            else:
+                return None
+
+            self._device_cache[key] = (device, time.monotonic())
+            return device
+
+    def _invalidate_device(self, device_name: str):
+        """Oublie la connexion et l'état connu d'un appareil : nouveau login au prochain appel"""
+        device_config = self.devices[device_name]
+        self._device_cache.pop((device_config['type'].upper(), device_config['ip']), None)
+        self._last_state.pop(device_name, None)
+
+    def _remember_state(self, device_name: str, is_on: bool):
+        """Mémorise l'état allumé/éteint d'un appareil"""
+        self._last_state[device_name] = (time.monotonic(), is_on)
+
+    def _known_state(self, device_name: str) -> Optional[bool]:
+        """Dernier état connu d'un appareil, None s'il date de plus de LAST_STATE_TTL secondes"""
+        cached = self._last_state.get(device_name)
+        if cached is not None and time.monotonic() - cached[0] < LAST_STATE_TTL:
+            return cached[1]
+        return None
+
+    async def _get_info(self, device_name: str, device):
+        """Informations de l'appareil, relues au plus une fois par DEVICE_INFO_TTL secondes"""
+        now = time.monotonic()
+        cached = self._info_cache.get(device_name)
+        if cached is not None and now - cached[0] < DEVICE_INFO_TTL:
+            return cached[1]
+
+        info = await device.get_device_info()
+        self._info_cache[device_name] = (now, info)
+        return info
+
+    async def _execute_action(self, device, device_name: str, action: str, device_type: str, params: TapoUnifiedParameters) -> Dict[str, Any]:
         """Exécute l'action spécifique sur l'appareil"""
         
         try:
             if action == "on":
                 await device.on()
+                self._remember_state(device_name, True)
                 return {"success": True, "action": "allumé"}
             
             elif action == "off":
                 await device.off()
+                self._remember_state(device_name, False)
                 return {"success": True, "action": "éteint"}
             
             elif action == "toggle":
-                # Obtenir l'état actuel et basculer
-                info = await device.get_device_info()
-                is_on = info.device_on if hasattr(info, 'device_on') else False
+                # Basculer depuis le dernier état connu récent, sinon le lire sur l'appareil
+                is_on = self._known_state(device_name)
+                if is_on is None:
+                    info = await self._get_info(device_name, device)
+                    is_on = info.device_on if hasattr(info, 'device_on') else False
 
                 if is_on:
                     await device.off()
+                    self._remember_state(device_name, False)
                     return {"success": True, "action": "éteint (basculé)"}
                 else:
                     await device.on()
+                    self._remember_state(device_name, True)
                     return {"success": True, "action": "allumé (basculé)"}
             
             elif action == "set_brightness" and device_type.upper() == 'L530':
                 # Utiliser 'value' comme dans bt_tapo_strict_2.py
                 brightness_value = params.value
                 await device.set_brightness(brightness_value)
+                # L'ampoule s'allume quand sa luminosité est réglée
+                self._remember_state(device_name, True)
                 return {"success": True, "action": f"luminosité réglée à {brightness_value}%"}
 
             elif action == "set_color" and device_type.upper() == 'L530':
@@ -443,10 +557,14 @@ class TapoAdapter(ToolAdapter):
                             hue, saturation = self._rgb_to_hue_sat(r, g, b)
                             await device.set_hue_saturation(hue, saturation)
 
+                # L'ampoule s'allume quand sa couleur est réglée
+                self._remember_state(device_name, True)
                 return {"success": True, "action": f"couleur réglée à RGB({r},{g},{b})"}
             
             elif action == "get_info":
-                info = await device.get_device_info()
+                info = await self._get_info(device_name, device)
+                if isinstance(getattr(info, 'device_on', None), bool):
+                    self._remember_state(device_name, info.device_on)
                 return {
                     "success": True,
                     "info": {
@@ -466,7 +584,12 @@ class TapoAdapter(ToolAdapter):
                     "supported_actions": [action.value for action in TapoAction]
                 }
                 
+        except (TypeError, ValueError) as e:
+            # Paramètres refusés : la connexion reste valide
+            return {"success": False, "error": str(e)}
         except Exception as e:
+            # Erreur de transport ou d'authentification (session expirée, appareil redémarré)
+            self._invalidate_device(device_name)
             return {"success": False, "error": str(e)}
     
     async def _set_color(self, device, **kwargs) -> Dict[str, Any]:
@@ -571,6 +694,10 @@ class TapoAdapter(ToolAdapter):
     
     def get_parameters_schema(self) -> Dict[str, Any]:
         """Schéma des paramètres pour OpenAI function calling avec paramètres conditionnels"""
+        return self._schema_cache
+
+    def _build_schema(self) -> Dict[str, Any]:
+        """Construit le schéma des paramètres depuis la configuration des appareils"""
         # Construire les enums dynamiquement depuis la configuration
         device_names = list(self.devices.keys()) if self.devices else []
         actions = [action.value for action in TapoAction]
@@ -0,0 +1,203 @@
+"""
+Tests pour le traitement audio du module TTS GLaDOS
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sounddevice")
+scipy_signal = pytest.importorskip("scipy.signal")
+
+from glados.outputs.tts.glados_tts import GLaDOSTTSOutput, _StreamingResampler
+
+
+@pytest.fixture
+def tts_config():
+    return {
+        'model_path': 'models/test.onnx',
+        'sample_rate': 22050,
+        'volume': 0.5,
+        'audio_cache_size': 2
+    }
+
+
+def test_prepare_audio_q15_gain(tts_config):
+    """Test le volume en arithmétique entière sans resampling"""
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    samples = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+
+    result = tts._prepare_audio(samples, 22050)
+
+    assert result.dtype == np.int16
+    assert result.tolist() == [0, 500, -500, 16383, -16384]
+
+
+def test_prepare_audio_unity_volume_returns_input(tts_config):
+    """Test qu'un volume de 1 ne modifie pas les échantillons"""
+    tts_config['volume'] = 1.0
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    samples = np.array([1, -2, 3], dtype=np.int16)
+
+    assert tts._prepare_audio(samples, 22050) is samples
+
+
+def test_prepare_audio_resample_length_and_dtype(tts_config):
+    """Test le resampling 22050 -> 48000 Hz (longueur, type, volume)"""
+    tts_config['sample_rate'] = 48000
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    samples = np.full(22050, 20000, dtype=np.int16)
+
+    result = tts._prepare_audio(samples, 22050)
+
+    assert result.dtype == np.int16
+    assert len(result) == 48000
+    # Volume appliqué par la multiplication float32 (casting='unsafe'), ondulation du filtre près
+    assert abs(int(result[24000]) - 10000) < 20
+
+
+def test_prepare_audio_resample_clips_to_int16(tts_config):
+    """Test l'écrêtage du signal rééchantillonné dans la plage int16"""
+    tts_config['sample_rate'] = 48000
+    tts_config['volume'] = 1.0
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    # Signal carré pleine échelle : le filtre dépasse la plage int16 aux transitions
+    samples = np.repeat(np.tile(np.array([32767, -32768], dtype=np.int16), 20), 50)
+
+    result = tts._prepare_audio(samples, 22050)
+
+    assert result.dtype == np.int16
+    # Écrêté et non replié : les extrêmes restent atteints sans inversion de signe
+    assert result.max() == 32767 and result.min() == -32768
+    assert (result[60:105] > 0).all()
+
+
+def test_streaming_resampler_matches_resample_poly():
+    """Test que le rééchantillonnage par blocs équivaut au signal complet"""
+    signal = np.random.default_rng(0).standard_normal(30000).astype(np.float32)
+    resampler = _StreamingResampler(22050, 48000)
+
+    blocks = [resampler.process(block) for block in np.array_split(signal[:-1000], 7)]
+    blocks.append(resampler.process(signal[-1000:], final=True))
+
+    expected = scipy_signal.resample_poly(signal, 320, 147)
+    np.testing.assert_array_equal(np.concatenate(blocks), expected)
+
+
+def test_audio_cache_evicts_least_recently_used(tts_config):
+    """Test l'éviction LRU du cache des synthèses"""
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    audio = np.zeros(4, dtype=np.int16)
+
+    tts._cache_audio('a', audio, 22050)
+    tts._cache_audio('b', audio, 22050)
+    tts._audio_cache.move_to_end('a')  # 'a' relu : 'b' devient le plus ancien
+    tts._cache_audio('c', audio, 22050)
+
+    assert list(tts._audio_cache) == ['a', 'c']
+
+
+def test_audio_cache_bounded_by_bytes(tts_config):
+    """Test l'éviction selon la mémoire totale et le refus des synthèses trop grosses"""
+    tts_config.update(audio_cache_size=10, audio_cache_max_bytes=20)
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+
+    tts._cache_audio('a', np.zeros(4, dtype=np.int16), 22050)  # 8 octets
+    tts._cache_audio('b', np.zeros(4, dtype=np.int16), 22050)
+    tts._cache_audio('c', np.zeros(4, dtype=np.int16), 22050)  # 24 > 20 : 'a' évincé
+    tts._cache_audio('d', np.zeros(16, dtype=np.int16), 22050)  # 32 octets : ignoré
+
+    assert list(tts._audio_cache) == ['b', 'c']
+    assert tts._audio_cache_bytes == 16
+
+
+def test_audio_cache_disabled(tts_config):
+    """Test qu'une taille de cache nulle désactive le cache"""
+    tts_config['audio_cache_size'] = 0
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+
+    tts._cache_audio('a', np.zeros(4, dtype=np.int16), 22050)
+
+    assert not tts._audio_cache
+
+
+def test_optimized_model_file_depends_on_providers_and_version(tts_config, tmp_path):
+    """Test qu'un graphe optimisé n'est pas réutilisé après un changement de provider ou d'ONNX Runtime"""
+    model_file = tmp_path / 'voice.onnx'
+    model_file.write_bytes(b'')
+    ort = MagicMock(__version__='1.17.0')
+    ort.get_available_providers.return_value = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+
+    with patch.dict('sys.modules', {'onnxruntime': ort}):
+        cpu_file = tts._optimized_model_file(model_file)
+        tts.ort_providers = ['CUDAExecutionProvider']
+        cuda_file = tts._optimized_model_file(model_file)
+        ort.__version__ = '1.18.0'
+        upgraded_file = tts._optimized_model_file(model_file)
+
+    assert len({cpu_file, cuda_file, upgraded_file}) == 3
+    assert all(f.name.startswith('voice.opt-extended-') for f in (cpu_file, cuda_file, upgraded_file))
+
+
+@pytest.mark.asyncio
+async def test_speak_streaming_falls_back_when_nothing_played(tts_config):
+    """Test la synthèse complète quand le streaming échoue avant la première fenêtre"""
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    tts.voice = SimpleNamespace(config=SimpleNamespace(sample_rate=22050),
+                                phonemize=lambda text: [list(text)], phonemes_to_ids=lambda p: [1, 2])
+    tts._encoder_session = MagicMock()
+    tts._encoder_session.run.side_effect = RuntimeError("sortie 'z' absente")
+    tts._stream = MagicMock()
+    samples = np.zeros(4, dtype=np.int16)
+    tts._synthesize_text = AsyncMock(return_value=(samples, 22050))
+    tts._play_audio = AsyncMock(return_value=True)
+
+    assert await tts._speak_streaming("Bonjour") is True
+    tts._synthesize_text.assert_awaited_once_with("Bonjour")
+    tts._play_audio.assert_awaited_once_with(samples, 22050)
+    tts._stream.write.assert_not_called()
+
+
+def test_load_split_model_checks_encoder_outputs(tts_config):
+    """Test que le modèle découpé est refusé si l'encodeur ne produit pas z et y_mask"""
+    def nodes(*names):
+        return [SimpleNamespace(name=name) for name in names]
+
+    encoder = MagicMock()
+    encoder.get_inputs.return_value = nodes('input', 'input_lengths', 'scales')
+    encoder.get_outputs.return_value = nodes('latents', 'mask')
+    decoder = MagicMock()
+    decoder.get_inputs.return_value = nodes('z', 'y_mask')
+    tts_config.update(encoder_model_path='/models/encoder.onnx', decoder_model_path='/models/decoder.onnx')
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    tts._optimized_model_file = lambda model_file: model_file
+    tts._create_session = MagicMock(side_effect=[encoder, decoder])
+
+    with patch.dict('sys.modules', {'onnxruntime': MagicMock()}):
+        tts._load_split_model()
+
+    assert tts._encoder_session is None and tts._decoder_session is None
+
+
+@pytest.mark.asyncio
+async def test_play_audio_prepares_off_event_loop(tts_config):
+    """Test que volume et resampling sont calculés hors de la boucle d'événements"""
+    tts_config['sample_rate'] = 48000
+    tts = GLaDOSTTSOutput('tts_test', tts_config)
+    tts._stream = MagicMock()
+    prepare = tts._prepare_audio
+    threads = []
+
+    def record_thread(audio_data, sample_rate):
+        threads.append(threading.get_ident())
+        return prepare(audio_data, sample_rate)
+
+    tts._prepare_audio = record_thread
+    assert await tts._play_audio(np.zeros(2205, dtype=np.int16), 22050) is True
+
+    assert threads and threads[0] != threading.get_ident()
+    assert len(tts._stream.write.call_args.args[0]) == 4800
@@ -0,0 +1,294 @@
+"""
+Tests pour l'encodage des trames IR (OSRAM, Yamaha)
+"""
+
+import fcntl
+import os
+import struct
+from itertools import accumulate
+from typing import get_args
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from glados.tools.ir_common import (
+    LIRC_MAX_DURATION_US, NEC_FRAME_PERIOD_US, build_schedule, build_wave, ir_backend, pack_lirc,
+    with_repeats
+)
+from glados.tools.ir_osram import ir_osram_adapter
+from glados.tools.ir_osram.ir_osram_adapter import (
+    IROsramAdapter, OsramGeneralParameters, OsramRGBWRemote,
+    _ALIAS_COMMANDS, _COMMAND_MAPPING as OSRAM_COMMAND_MAPPING, _PULSES_BY_NAME
+)
+from glados.tools.ir_yamaha import ir_yamaha_adapter
+from glados.tools.ir_yamaha.ir_yamaha_adapter import (
+    IRYamahaAdapter, YamahaGeneralParameters, YAMAHA_COMMANDS, _COMMAND_MAPPING, _UNMAPPED_COMMANDS
+)
+
+
+def _frame_starts(sequence):
+    """Instants de début (µs) de la trame et de chaque code de répétition"""
+    starts = [0]
+    elapsed = list(accumulate(sequence))
+    for i in range(len(sequence) - 3):
+        if i % 2 == 1 and tuple(sequence[i + 1:i + 4]) == (9000, 2250, 560):
+            starts.append(elapsed[i])
+    return starts
+
+
+def test_with_repeats_without_repeat_returns_frame():
+    """Test qu'aucun code de répétition n'est ajouté pour repeat_count=0"""
+    pulses = _PULSES_BY_NAME['ON']
+
+    assert with_repeats(pulses, 0) == pulses
+
+
+def test_with_repeats_appends_nec_repeat_codes():
+    """Test le code de répétition 9000/2250/560 après la trame"""
+    pulses = _PULSES_BY_NAME['RED']
+
+    sequence = with_repeats(pulses, 2)
+
+    assert sequence[:len(pulses)] == pulses
+    repeats = sequence[len(pulses):]
+    assert repeats == (
+        NEC_FRAME_PERIOD_US - sum(pulses), 9000, 2250, 560,
+        NEC_FRAME_PERIOD_US - 11810, 9000, 2250, 560
+    )
+
+
+def test_with_repeats_keeps_108ms_frame_period():
+    """Test que chaque code de répétition démarre 108 ms après le précédent"""
+    sequence = with_repeats(_PULSES_BY_NAME['BLUE'], 3)
+
+    starts = _frame_starts(sequence)
+
+    assert starts == [0, 108000, 216000, 324000]
+    # La séquence forme des paires ON/OFF et se termine sur une impulsion ON
+    assert len(sequence) % 2 == 1
+
+
+def test_build_schedule_marks_and_space_ends():
+    """Test la séparation en impulsions ON et échéances de fin de pause (ns)"""
+    marks, space_ends = build_schedule((9000, 4500, 560, 1690, 560))
+
+    assert marks.tolist() == [9000, 560, 560]
+    assert space_ends.tolist() == [13_500_000, 15_750_000, 16_310_000]
+
+
+def test_build_schedule_with_repeats_matches_frame_period():
+    """Test que le planning d'une trame répétée respecte la période NEC"""
+    pulses = _PULSES_BY_NAME['ON']
+    marks, space_ends = build_schedule(with_repeats(pulses, 1))
+
+    assert len(marks) == len(space_ends)
+    assert marks[-3:].tolist() == [560, 9000, 560]
+    # Le code de répétition démarre à la fin de la pause qui suit la trame
+    assert space_ends[len(pulses) // 2] == NEC_FRAME_PERIOD_US * 1000
+    assert space_ends[-1] == (NEC_FRAME_PERIOD_US + 11810) * 1000
+
+
+@pytest.mark.parametrize("config, expected", [
+    ({}, 'bitbang'),
+    ({'lirc_device': '/dev/lirc0'}, 'lirc'),
+    ({'lirc_device': '/dev/lirc0', 'ir_backend': 'bitbang'}, 'bitbang'),
+    ({'ir_backend': 'tx_wave'}, 'tx_wave'),
+])
+def test_ir_backend_defaults_to_bitbang_without_lirc(config, expected):
+    """Test le mode d'émission : tx_wave uniquement sur demande explicite"""
+    assert ir_backend(config) == expected
+
+
+@pytest.mark.parametrize("config", [{'ir_backend': 'pwm'}, {'ir_backend': 'lirc'}])
+def test_ir_backend_rejects_invalid_config(config):
+    """Test un mode inconnu ou LIRC sans périphérique"""
+    with pytest.raises(ValueError):
+        ir_backend(config)
+
+
+def test_build_wave_carries_mark_remainder_into_space():
+    """Test que le reste d'une impulsion non multiple de la porteuse allonge la pause suivante"""
+    lgpio = MagicMock()
+    lgpio.pulse.side_effect = lambda bits, mask, delay: (bits, delay)
+
+    with patch.dict('sys.modules', {'lgpio': lgpio}):
+        wave = build_wave((560, 560, 560))
+
+    # 560 µs = 21 cycles de 26 µs + 14 µs reportés sur la pause
+    assert len(wave) == 21 * 2 + 1 + 21 * 2
+    assert wave[42] == (0, 574)
+    assert sum(delay for _, delay in wave[:43]) == 1120
+
+
+def _unpack_lirc(chunks):
+    """Impulsions de chaque écriture LIRC d'une séquence issue de pack_lirc"""
+    return [struct.unpack(f'{len(buffer) // 4}I', buffer) for buffer, _ in chunks]
+
+
+@pytest.mark.parametrize("repeat_count", range(11))
+def test_osram_lirc_writes_stay_under_kernel_limit(repeat_count):
+    """Test qu'aucune écriture LIRC ne dépasse IR_MAX_DURATION (500 ms) du noyau"""
+    sequence = with_repeats(_PULSES_BY_NAME['RED'], repeat_count)
+
+    chunks = pack_lirc(sequence)
+    writes = _unpack_lirc(chunks)
+
+    assert all(sum(pulses) <= LIRC_MAX_DURATION_US for pulses in writes)
+    # Écritures terminées sur une impulsion ON, durée totale conservée avec les pauses retirées
+    assert all(len(pulses) % 2 == 1 for pulses in writes)
+    assert sum(map(sum, writes)) + sum(gap_ns for _, gap_ns in chunks) // 1000 == sum(sequence)
+    assert chunks[-1][1] == 0
+
+
+def test_lirc_sequence_under_limit_single_write():
+    """Test qu'une séquence courte reste émise en une seule écriture"""
+    sequence = with_repeats(_PULSES_BY_NAME['ON'], 4)
+
+    assert _unpack_lirc(pack_lirc(sequence)) == [sequence]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("repeat_count, expected_repeats", [(1, 0), (3, 2)])
+async def test_yamaha_repeat_count_includes_first_frame(repeat_count, expected_repeats):
+    """Test que repeat_count Yamaha compte la trame : 1 n'ajoute aucun code de répétition"""
+    adapter = IRYamahaAdapter('yamaha_test', {})
+    adapter.remote = MagicMock()
+
+    result = await adapter.execute(action='volume', command='vol_up', repeat_count=repeat_count)
+
+    assert result['success'] is True
+    adapter.remote.prepare_command.assert_called_once_with('VOL_UP', expected_repeats)
+    await adapter.cleanup()
+
+
+def test_osram_gpio_claim_failure_closes_chip():
+    """Test que le gpiochip est refermé si la réservation de la broche échoue"""
+    lgpio = MagicMock()
+    lgpio.gpiochip_open.return_value = 7
+    lgpio.gpio_claim_output.side_effect = Exception("GPIO busy")
+
+    with patch.object(ir_osram_adapter, 'lgpio', lgpio, create=True), \
+            patch.object(ir_osram_adapter, 'LGPIO_AVAILABLE', True):
+        with pytest.raises(RuntimeError):
+            OsramRGBWRemote(ir_pin=19)
+
+    lgpio.gpiochip_close.assert_called_once_with(7)
+
+
+@pytest.mark.asyncio
+async def test_osram_remote_failure_cached_until_retry_delay():
+    """Test qu'un échec d'initialisation est renvoyé sans réessayer avant le délai"""
+    adapter = IROsramAdapter('osram_test', {})
+    adapter._ir_ready = True
+
+    with patch.object(ir_osram_adapter, 'OsramRGBWRemote', side_effect=RuntimeError("GPIO busy")) as remote:
+        first = await adapter.execute(action='power', command='on')
+        second = await adapter.execute(action='power', command='on')
+
+        assert remote.call_count == 1
+        assert first['success'] is False and 'GPIO busy' in first['error']
+        assert second == first
+
+        # Délai écoulé : nouvelle tentative
+        adapter._remote_retry_at = 0.0
+        await adapter.execute(action='power', command='on')
+        assert remote.call_count == 2
+
+    await adapter.cleanup()
+
+
+def test_yamaha_command_mapping_matches_remote_table():
+    """Test le mapping complet des commandes Yamaha vers les noms de la télécommande"""
+    assert _COMMAND_MAPPING == {
+        'power': 'POWER', 'vol_up': 'VOL_UP', 'vol_down': 'VOL_DOWN',
+        'play': 'PLAY', 'pause': 'PAUSE', 'stop': 'STOP', 'ff': 'FF', 'rew': 'REW',
+        'tuner': 'TUNER', 'tape': 'TAPE', 'aux': 'AUX', 'md': 'MD', 'dvd': 'DVD', 'mode': 'MODE',
+        'digit_0': 'DIGIT_0', 'digit_1': 'DIGIT_1', 'digit_2': 'DIGIT_2', 'digit_3': 'DIGIT_3',
+        'digit_4': 'DIGIT_4', 'digit_5': 'DIGIT_5', 'digit_6': 'DIGIT_6', 'digit_7': 'DIGIT_7',
+        'digit_8': 'DIGIT_8', 'digit_9': 'DIGIT_9',
+        'random': 'RANDOM_B', 'repeat': 'REP_A', 'display': 'DISPLAY', 'sleep': 'SLEEP',
+        'preset_up': 'PRESET_UP', 'preset_down': 'PRESET_DN'
+    }
+
+
+@pytest.mark.asyncio
+async def test_yamaha_unmapped_command_not_sent():
+    """Test qu'une commande validée mais non mappée n'est pas émise"""
+    adapter = IRYamahaAdapter('yamaha_test', {})
+    adapter.remote = MagicMock()
+
+    result = await adapter.execute(action='function', command='time')
+
+    assert result == {"success": False, "error": "Commande 'time' non mappée"}
+    adapter.remote.prepare_command.assert_not_called()
+    await adapter.cleanup()
+
+
+def _model_commands(model):
+    """Commandes acceptées par le Literal du modèle Pydantic"""
+    return set(get_args(model.model_fields['command'].annotation))
+
+
+def test_osram_mapping_covers_model_commands_and_aliases():
+    """Test que chaque commande du modèle et chaque alias ont un nom de télécommande"""
+    assert set(OSRAM_COMMAND_MAPPING) >= _model_commands(OsramGeneralParameters)
+    assert set(_ALIAS_COMMANDS.values()) <= set(OSRAM_COMMAND_MAPPING)
+
+
+def test_yamaha_mapping_covers_model_commands():
+    """Test que les commandes du modèle sont mappées (ou explicitement exclues) vers des codes connus"""
+    assert set(_COMMAND_MAPPING) | _UNMAPPED_COMMANDS >= _model_commands(YamahaGeneralParameters)
+    assert set(_COMMAND_MAPPING.values()) <= set(YAMAHA_COMMANDS)
+
+
+@pytest.mark.asyncio
+async def test_yamaha_lirc_volume_writes_stay_under_kernel_limit(tmp_path, monkeypatch):
+    """Test que le volume x10 (9 codes de répétition) est émis en écritures LIRC de 500 ms au plus"""
+    device = tmp_path / 'lirc0'
+    device.touch()
+    writes = []
+    monkeypatch.setattr(fcntl, 'ioctl', lambda fd, request, arg: 0)
+    monkeypatch.setattr(os, 'write', lambda fd, data: writes.append(data) or len(data))
+
+    adapter = IRYamahaAdapter('yamaha_test', {'lirc_device': str(device)})
+    result = await adapter.execute(action='volume', command='vol_up', repeat_count=10)
+    await adapter.cleanup()
+
+    assert result['success'] is True
+    durations = [sum(struct.unpack(f'{len(data) // 4}I', data)) for data in writes]
+    assert len(durations) > 1
+    assert max(durations) <= LIRC_MAX_DURATION_US
+
+
+@pytest.mark.parametrize("config, use_tx_wave", [({}, False), ({'ir_backend': 'tx_wave'}, True)])
+def test_yamaha_backend_bitbang_unless_tx_wave_configured(config, use_tx_wave):
+    """Test que la forme d'onde lgpio n'est utilisée que si ir_backend la demande"""
+    lgpio = MagicMock()  # tx_wave présent, comme dans toutes les versions publiées de lgpio
+
+    with patch.object(ir_yamaha_adapter, 'lgpio', lgpio, create=True), \
+            patch.object(ir_yamaha_adapter, 'LGPIO_AVAILABLE', True), \
+            patch.object(ir_yamaha_adapter, '_IR_READY', True):
+        adapter = IRYamahaAdapter('yamaha_test', config)
+        assert adapter.remote.use_tx_wave is use_tx_wave
+        adapter.remote.cleanup()
+
+    assert ir_yamaha_adapter.YamahaRemote._chip_handle is None
+
+
+def test_yamaha_bitbang_uses_shared_schedule():
+    """Test que le bit-bang Yamaha émet le même échéancier que l'OSRAM (ir_common)"""
+    lgpio = MagicMock()
+
+    with patch.object(ir_yamaha_adapter, 'lgpio', lgpio, create=True), \
+            patch.object(ir_yamaha_adapter, 'LGPIO_AVAILABLE', True), \
+            patch.dict('sys.modules', {'lgpio': lgpio}):
+        remote = ir_yamaha_adapter.YamahaRemote(ir_pin=18)
+        schedule = remote.prepare_command('VOL_UP', 2)
+        with patch('glados.tools.ir_common.wait_until'):
+            remote.send_prepared(schedule)
+        remote.cleanup()
+
+    expected = build_schedule(with_repeats(ir_yamaha_adapter._nec_pulses(YAMAHA_COMMANDS['VOL_UP']), 2))
+    assert schedule == expected
+    # Une impulsion ON par rafale puis broche à 0 : la dernière écriture éteint la LED
+    assert lgpio.gpio_write.call_args_list[-1].args[1:] == (18, 0)
@@ -5,7 +5,7 @@ Tests pour l'adaptateur Tapo
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from glados.tools.tapo.tapo_adapter import TapoAdapter
+from glados.tools.tapo.tapo_adapter import LAST_STATE_TTL, TapoAdapter
 
 
 @pytest.fixture
@@ -107,6 +107,131 @@ async def test_tapo_adapter_toggle_device(tapo_config, mock_tapo_client):
         device_mock.off.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_tapo_adapter_reuses_device_connection(tapo_config, mock_tapo_client):
+    """Test la réutilisation de la connexion à un appareil entre deux appels"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        await adapter.execute(device_name='test_lamp', action='on')
+        await adapter.execute(device_name='test_lamp', action='off')
+        
+        client_mock.l530.assert_called_once_with('192.168.1.100')
+        assert device_mock.on.call_count == 1
+        assert device_mock.off.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tapo_adapter_info_cache_invalidated_on_write(tapo_config, mock_tapo_client):
+    """Test le cache des informations et son invalidation après une action"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        await adapter.execute(device_name='test_lamp', action='get_info')
+        await adapter.execute(device_name='test_lamp', action='get_info')
+        assert device_mock.get_device_info.call_count == 1
+        
+        await adapter.execute(device_name='test_lamp', action='off')
+        await adapter.execute(device_name='test_lamp', action='get_info')
+        assert device_mock.get_device_info.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tapo_adapter_all_off(tapo_config, mock_tapo_client):
+    """Test éteindre tous les appareils en une fois"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        results = await adapter.all_off()
+        
+        assert [result['success'] for result in results] == [True, True]
+        assert device_mock.off.call_count == 2
+        assert await adapter.execute_many([]) == []
+
+
+@pytest.mark.asyncio
+async def test_tapo_adapter_toggle_uses_last_state(tapo_config, mock_tapo_client):
+    """Test basculer depuis le dernier état connu sans relire l'appareil"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        await adapter.execute(device_name='test_plug', action='off')
+        result = await adapter.execute(device_name='test_plug', action='toggle')
+        
+        assert result['success'] is True
+        assert 'allumé' in result['action']
+        device_mock.get_device_info.assert_not_called()
+        device_mock.on.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_tapo_adapter_toggle_rereads_expired_state(tapo_config, mock_tapo_client):
+    """Test basculer depuis l'appareil quand le dernier état connu a expiré"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        await adapter.execute(device_name='test_plug', action='off')
+        timestamp, state = adapter._last_state['test_plug']
+        adapter._last_state['test_plug'] = (timestamp - LAST_STATE_TTL, state)
+        
+        result = await adapter.execute(device_name='test_plug', action='toggle')
+        
+        # L'appareil indique device_on = True : basculé vers éteint
+        assert result['success'] is True
+        assert 'éteint' in result['action']
+        device_mock.get_device_info.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("action, params", [
+    ('set_brightness', {'value': 50}),
+    ('set_color', {'color': 'red'}),
+])
+async def test_tapo_adapter_toggle_after_setting_turns_off(tapo_config, mock_tapo_client, action, params):
+    """Test que régler luminosité ou couleur (qui allume l'ampoule) est pris en compte par toggle"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        await adapter.execute(device_name='test_lamp', action='off')
+        result = await adapter.execute(device_name='test_lamp', action=action, **params)
+        assert result['success'] is True
+        
+        result = await adapter.execute(device_name='test_lamp', action='toggle')
+        
+        assert 'éteint' in result['action']
+        device_mock.on.assert_not_called()
+        assert device_mock.off.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_tapo_adapter_reconnects_after_transport_error(tapo_config, mock_tapo_client):
+    """Test la reconnexion après une erreur de transport, pas après un paramètre refusé"""
+    adapter = TapoAdapter('tapo_test', tapo_config)
+    client_mock, device_mock = mock_tapo_client
+    
+    with patch('glados.tools.tapo.tapo_adapter.ApiClient', return_value=client_mock):
+        device_mock.set_brightness.side_effect = ValueError("valeur refusée")
+        result = await adapter.execute(device_name='test_lamp', action='set_brightness', value=50)
+        assert result == {"success": False, "error": "valeur refusée",
+                          "device_name": "Test Lamp", "device_type": "L530"}
+        
+        device_mock.on.side_effect = Exception("session expirée")
+        result = await adapter.execute(device_name='test_lamp', action='on')
+        assert result['success'] is False
+        assert client_mock.l530.call_count == 1
+        
+        device_mock.on.side_effect = None
+        result = await adapter.execute(device_name='test_lamp', action='on')
+        assert result['success'] is True
+        assert client_mock.l530.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_tapo_adapter_set_brightness(tapo_config, mock_tapo_client):
     """Test régler la luminosité"""